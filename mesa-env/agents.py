@@ -1,5 +1,7 @@
 from mesa import Model, Agent
 from task import Task
+from suspicion import record_covisibility, trace_entry
+from events import DEBUG
 from mesa.time import RandomActivation
 from mesa.space import MultiGrid
 from mesa.datacollection import DataCollector
@@ -8,15 +10,29 @@ import random
 
 
 class PlayerAgent(Agent):
+    # Mesa's Agent base still carries a __dict__ for unique_id/model/pos
+    __slots__ = ("visibility", "alive", "_rng")
+
     def __init__(self, unique_id, model, visibility):
         super().__init__(unique_id, model)
         self.visibility = visibility
         self.alive = True
+        self._rng = None
 
-    def move_toward(self, target_location):
-        """Move 1 cell toward target location only if valid and not already there."""
+    @property
+    def rng(self):
+        """Per-agent stream, so an agent's draws don't depend on activation order.
+
+        Created on first use: a Random's state is ~2.5KB and most agents never draw.
+        """
+        if self._rng is None:
+            self._rng = random.Random(f"{self.model.agent_seed}:{self.unique_id}")
+        return self._rng
+
+    def next_position(self, target_location):
+        """Cell one step toward target location, or None if already there or blocked."""
         if not target_location or self.pos == target_location:
-            return
+            return None
 
         x, y = self.pos
         tx, ty = target_location
@@ -31,86 +47,61 @@ class PlayerAgent(Agent):
         if step_x != 0:
             new_pos = (x + step_x, y)
             if self.model.is_valid_position(new_pos):
-                self.model.grid.move_agent(self, new_pos)
-                return
+                return new_pos
 
         # Then try y-axis
         if step_y != 0:
             new_pos = (x, y + step_y)
             if self.model.is_valid_position(new_pos):
-                self.model.grid.move_agent(self, new_pos)
-                return
+                return new_pos
 
         # Finally try diagonal
         if step_x != 0 and step_y != 0:
             new_pos = (x + step_x, y + step_y)
             if self.model.is_valid_position(new_pos):
-                self.model.grid.move_agent(self, new_pos)
+                return new_pos
+        return None
+
+    def move_toward(self, target_location):
+        """Move 1 cell toward target location only if valid and not already there."""
+        new_pos = self.next_position(target_location)
+        if new_pos:
+            self.model.move_agent(self, new_pos)
 
 
 class Crewmate(PlayerAgent):
+    __slots__ = ("tasks", "suspicion_pairs", "_trace_file")
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model, visibility=6)
-        main_rooms = [room for room in model.rooms if room[4] != "Hallway"]
-        self.tasks = [
-            Task(f"{room[4]} Task", ((room[0] + room[2]) // 2, (room[1] + room[3]) // 2))
-            for room in main_rooms
-        ]
-        self.suspicion_pairs = {}  # Format: {frozenset: {"count": int, "rooms": list}}
+        self.tasks = [Task(f"{room} Task", location) for room, location in model.task_specs]
+        self.suspicion_pairs = {}  # Format: {frozenset: SuspicionRecord}
+        self._trace_file = None
 
     def update_suspicions(self, visible_agents):
         current_room = self.model.get_room(self.pos)
         visible_players = [
-            a for a in visible_agents 
+            a.unique_id for a in visible_agents
             if a != self and isinstance(a, (Crewmate, Imposter))
         ]
-        
-        # Initialize suspicion_pairs if missing
-        if not hasattr(self, 'suspicion_pairs'):
-            self.suspicion_pairs = {}
-
-        # Collect all unique pairs this step for tracing
-        trace_pairs = set()
-        # Track pairs for suspicion (separate from tracing)
-        for i in range(len(visible_players)):
-            for j in range(i + 1, len(visible_players)):
-                agent1 = visible_players[i].unique_id
-                agent2 = visible_players[j].unique_id
-                pair = frozenset({agent1, agent2})
-
-                # For tracing (your original format)
-                trace_pairs.add(f"{{Agent {min(agent1, agent2)}, Agent {max(agent1, agent2)}, {current_room}}}")
-
-                # Initialize pair data structure properly
-                if pair not in self.suspicion_pairs:
-                    self.suspicion_pairs[pair] = {"count": 0, "rooms": []}
-                
-                # Update count (not the whole dict)
-                self.suspicion_pairs[pair]["count"] += 1
-                self.suspicion_pairs[pair]["rooms"].append(current_room)
-        
-        # Write to trace file
-        if not hasattr(self, '_trace_file'):
-            self._trace_file = open(f"agent_{self.unique_id}_trace.log", "w")
-        self._trace_file.write(
-            f"Step {self.model.schedule.steps}: [{', '.join(sorted(trace_pairs))}]\n"
+
+        step = self.model.schedule.steps
+        trace_pairs = record_covisibility(
+            self.suspicion_pairs, visible_players, current_room, step, self.model.suspicion_window
         )
 
-        trace_line = f"Step {self.model.schedule.steps}: "
-        trace_line += f"Alive({self.alive}), "
-        trace_line += f"Pos({self.pos}), "
-        trace_line += f"Visible: {[a.unique_id for a in visible_agents if a != self]}"
-        
-        self._trace_file.write(trace_line + "\n")
+        # Write to trace file
+        if self._trace_file is None:
+            self._trace_file = open(f"agent_{self.unique_id}_trace.log", "w")
+        self._trace_file.write(trace_entry(
+            step, trace_pairs, self.alive, self.pos, [a.unique_id for a in visible_agents if a != self]
+        ))
         self._trace_file.flush()
-        
-        # Debug output
-        # print(f"Agent {self.unique_id} suspicion_pairs: {self.suspicion_pairs}")
 
-        
     def close_trace_file(self):
-        if hasattr(self, '_trace_file'):
+        if self._trace_file is not None:
             self._trace_file.close()
+            self._trace_file = None
 
     def find_nearest_task(self):
         closest, min_dist = None, float("inf")
@@ -128,23 +119,28 @@ class Crewmate(PlayerAgent):
         if self.pos == task.location:
             task.do_task()
             if task.complete:
-                print(f"Agent {self.unique_id} completed {task.name}!")
-                
+                log = self.model.log
+                log.info("task_complete", "Agent %s completed %s!", self.unique_id, task.name,
+                         agent=self.unique_id, task=task.name)
+
                 # Check if this agent has completed all their tasks
                 if all(t.complete for t in self.tasks):
-                    print(f"\nAgent {self.unique_id} has completed all their tasks!")
-                    # List remaining agents with incomplete tasks
-                    agents_with_tasks = [
-                        a for a in self.model.schedule.agents
-                        if isinstance(a, Crewmate) and a.alive and not all(t.complete for t in a.tasks)
-                    ]
-                    if agents_with_tasks:
-                        print("Agents still with incomplete tasks:")
-                        for agent in agents_with_tasks:
-                            incomplete = sum(1 for t in agent.tasks if not t.complete)
-                            print(f"- Agent {agent.unique_id}: {incomplete} tasks remaining")
-                    else:
-                        print("All alive crewmates have completed their tasks!")
+                    log.info("tasks_done", "\nAgent %s has completed all their tasks!", self.unique_id,
+                             agent=self.unique_id)
+                    # Listing remaining agents scans everyone, so only do it when debugging
+                    if log.is_enabled(DEBUG):
+                        agents_with_tasks = [
+                            a for a in self.model.schedule.agents
+                            if isinstance(a, Crewmate) and a.alive and not all(t.complete for t in a.tasks)
+                        ]
+                        if agents_with_tasks:
+                            log.debug("tasks_remaining", "Agents still with incomplete tasks:")
+                            for agent in agents_with_tasks:
+                                incomplete = sum(1 for t in agent.tasks if not t.complete)
+                                log.debug("tasks_remaining", "- Agent %s: %s tasks remaining",
+                                          agent.unique_id, incomplete)
+                        else:
+                            log.debug("tasks_remaining", "All alive crewmates have completed their tasks!")
 
     
     def check_for_bodies(self, visible_agents):
@@ -152,7 +148,8 @@ class Crewmate(PlayerAgent):
             return False
         for agent in visible_agents:
             if isinstance(agent, (Crewmate, Imposter)) and not agent.alive:
-                print(f"Agent {self.unique_id} found body of {agent.unique_id}!")
+                self.model.log.info("body_found", "Agent %s found body of %s!", self.unique_id, agent.unique_id,
+                                    reporter=self.unique_id, body=agent.unique_id)
                 self.model.reported_body = agent.pos
                 self.model.phase = "discussion"
                 return True
@@ -177,66 +174,98 @@ class Crewmate(PlayerAgent):
     def get_dead_agent_pairs(self, dead_id):
         """Extract suspicion pairs involving dead agent"""
         return {
-            pair: data for pair, data in self.suspicion_pairs.items()
+            pair: record for pair, record in self.suspicion_pairs.items()
             if dead_id in pair
         }
     
     def calculate_heuristic_suspicion(self, suspect_id):
         """Calculate suspicion based on observed pairs"""
         return sum(
-            data["count"] 
-            for pair, data in self.suspicion_pairs.items()
+            record.count
+            for pair, record in self.suspicion_pairs.items()
             if suspect_id in pair
         )
 
-    def step(self):
-        if not self.alive:
-            return
+    def heuristic_argument(self, context, candidates):
+        """Vote without an LLM: whoever was seen most often with the victim"""
+        dead_id = context['dead_agent_id']
+        scores = {c: 0 for c in candidates if c != self.unique_id}
+        if not scores:
+            return None
+        for pair, record in self.get_dead_agent_pairs(dead_id).items():
+            for agent_id in pair:
+                if agent_id in scores:
+                    scores[agent_id] += record.count
+        suspect = max(sorted(scores), key=lambda c: (scores[c], self.calculate_heuristic_suspicion(c)))
+        return {"suspect": suspect, "reason": "Heuristic suspicion score", "confidence": 50}
+
+    def decide(self):
+        """Read-only: this tick's task and next cell, for simultaneous activation"""
+        task = self.find_nearest_task()
+        return task, (self.next_position(task.location) if task else None)
+
+    def commit(self, intent):
+        task, new_pos = intent
+        if new_pos:
+            self.model.move_agent(self, new_pos)
+        if task:
+            self.do_task(task)
 
+    def act(self):
+        """Move toward and work on the nearest task"""
         task = self.find_nearest_task()
         if task:
             self.move_toward(task.location)
             self.do_task(task)
 
+    def observe(self, visible_agents):
+        self.update_suspicions(visible_agents)
+        self.check_for_bodies(visible_agents)
+
+    def step(self):
+        if not self.alive:
+            return
+
+        self.act()
+
         visible_agents = self.model.grid.get_neighbors(
             self.pos, moore=True, radius=self.visibility, include_center=True
         )
-
-        self.update_suspicions(visible_agents)
-        self.check_for_bodies(visible_agents)
+        self.observe(visible_agents)
 
 
 class Imposter(PlayerAgent):
+    __slots__ = ("fake_tasks", "kill_cooldown", "lurk")
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model, visibility=9)
 
-        main_rooms = [room for room in model.rooms if room[4] != "Hallway"]
-        self.fake_tasks = [
-            Task(f"Fake {room[4]} Task", ((room[0] + room[2]) // 2, (room[1] + room[3]) // 2))
-            for room in main_rooms
-        ]
+        self.fake_tasks = [Task(f"Fake {room} Task", location) for room, location in model.task_specs]
         self.kill_cooldown = 0
+        self.lurk = None  # Low-traffic cell currently headed for
 
     def find_isolated_agent(self):
-        neighbors = self.model.grid.get_neighbors(self.pos, moore=True, radius=1)
-        potential_targets = [
-            a for a in neighbors if isinstance(a, Crewmate) and a.alive
-        ]
-        for target in potential_targets:
-            nearby = self.model.grid.get_neighbors(target.pos, moore=True, radius=1)
-            if len([a for a in nearby if a.alive and isinstance(a, (Crewmate, Imposter))]) == 1:
+        occupancy = self.model.occupancy
+        for target in occupancy.alive_around(self.pos):
+            if isinstance(target, Crewmate) and len(occupancy.alive_around(target.pos)) == 1:
                 return target
         return None
 
+    def is_adjacent(self, target):
+        """Whether ``target`` stands in one of the 8 cells around this imposter"""
+        (x, y), (tx, ty) = self.pos, target.pos
+        return max(abs(x - tx), abs(y - ty)) == 1
+
     def is_isolated(self, target):
-        neighbors = self.model.grid.get_neighbors(target.pos, moore=True, radius=1)
-        return len([a for a in neighbors if a != self and a.alive and isinstance(a, (Crewmate, Imposter))]) == 0
+        return all(a is self for a in self.model.occupancy.alive_around(target.pos))
 
     def kill(self, target):
-        if target.alive and self.is_isolated(target):
+        # Targets can come from a start-of-tick snapshot; the victim may have walked off since
+        if target.alive and self.is_adjacent(target) and self.is_isolated(target):
             target.alive = False
             self.kill_cooldown = 5
-            print(f"Agent {target.unique_id} was killed!")
+            self.model.log.info("kill", "Agent %s was killed!", target.unique_id,
+                                victim=target.unique_id, imposter=self.unique_id)
     
     def generate_argument(self, discussion_manager, context):
         try:
@@ -253,7 +282,15 @@ class Imposter(PlayerAgent):
         response = discussion_manager.llm.query_llm(prompt)
         return discussion_manager.parse_response(response)
 
-    def step(self):
+    def heuristic_argument(self, context, candidates):
+        """Vote without an LLM: frame a random alive crewmate"""
+        crewmates = [c for c in context['alive_crewmates'] if c in candidates]
+        if not crewmates:
+            return None
+        return {"suspect": self.rng.choice(crewmates), "reason": "Heuristic frame", "confidence": 50}
+
+    def step(self, candidates=None):
+        """Imposter turn; ``candidates`` are precomputed isolated targets, if any"""
         if not self.alive:
             return
 
@@ -261,10 +298,38 @@ class Imposter(PlayerAgent):
             self.kill_cooldown -= 1
             return
 
-        target = self.find_isolated_agent()
+        if candidates is None:
+            target = self.find_isolated_agent()
+        else:
+            target = next((a for a in candidates if a.alive and self.is_adjacent(a)), None)
+        self.act(target)
+
+    def act(self, target):
+        """Kill the target if there is one, then move toward a kill spot"""
         if target:
             self.kill(target)
 
-        # Move toward a fake task
-        task = self.fake_tasks[0]
-        self.move_toward(task.location)
+        self.move_toward(self.destination())
+
+    def plan_lurk(self):
+        """Low-traffic cell to head for: the current one, or the next once reached (or if the way is blocked)"""
+        if self.lurk is None or self.pos == self.lurk or self.next_position(self.lurk) is None:
+            return self.model.occupancy.next_lurk_spot(self.pos, avoid=self.lurk)
+        return self.lurk
+
+    def destination(self):
+        """Patrol low-traffic cells, falling back to a fake task"""
+        self.lurk = self.plan_lurk()
+        return self.lurk or self.fake_tasks[0].location
+
+    def decide(self):
+        """Read-only: (target, next cell, lurk spot) for simultaneous activation, None while cooling down"""
+        if self.kill_cooldown > 0:
+            return None
+        lurk = self.plan_lurk()
+        return self.find_isolated_agent(), self.next_position(lurk or self.fake_tasks[0].location), lurk
+
+    def commit(self, intent):
+        _, new_pos, self.lurk = intent
+        if new_pos:
+            self.model.move_agent(self, new_pos)
@@ -4,6 +4,9 @@ from model import AmongUsModel
 from agents import Imposter
 from call_label_agent import CellLabelAgent # Make sure to import CellLabelAgent
 from voting import VotingDisplay
+from spectator import SpectatorServer
+from metrics import start_metrics_server
+import argparse
 import socket
 import time
 from mesa.visualization.UserParam import UserSettableParameter
@@ -75,12 +78,41 @@ def find_free_port():
         s.bind(('', 0))
         return s.getsockname()[1]
 
-def run_server():
-    port = find_free_port()
-    print(f"Starting server on port {port}")
-
+def build_elements():
     grid = CanvasGrid(agent_portrayal_with_rooms, 20, 20, 500, 500)
     voting_display = VotingDisplay()
+    return [grid, voting_display]
+
+def serve_metrics(metrics_port):
+    if metrics_port:
+        start_metrics_server(metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{metrics_port}/metrics")
+
+def run_spectator_server(record_path=None, replay_path=None, metrics_port=None):
+    """One shared simulation (or replay) for any number of viewers"""
+    serve_metrics(metrics_port)
+    port = find_free_port()
+    print(f"Starting spectator server on port {port}")
+
+    server = SpectatorServer(
+        AmongUsModel,
+        build_elements(),
+        "Among Us Simulation (spectator)",
+        {"num_agents": 8, "num_imposters": 1, "width": 20, "height": 20},
+        port=port,
+        replay_path=replay_path,
+        record_path=record_path
+    )
+
+    try:
+        server.launch()
+    except KeyboardInterrupt:
+        print("\nServer shut down successfully")
+
+def run_server(metrics_port=None):
+    serve_metrics(metrics_port)  # Retries below call run_server() without it
+    port = find_free_port()
+    print(f"Starting server on port {port}")
 
     # Use UserSettableParameter for interactive model parameters
     model_params = {
@@ -92,7 +124,7 @@ def run_server():
 
     server = ModularServer(
         AmongUsModel,
-        [grid, voting_display],
+        build_elements(),
         "Among Us Simulation",
         model_params,
         port=port
@@ -111,4 +143,14 @@ def run_server():
         print(f"Unexpected error: {e}")
 
 if __name__ == "__main__":
-    run_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Among Us simulation server")
+    parser.add_argument("--spectate", action="store_true", help="Share one simulation between all viewers")
+    parser.add_argument("--record", help="Write spectator frames to this replay file")
+    parser.add_argument("--replay", help="Serve a recorded replay instead of a live simulation")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+    args = parser.parse_args()
+
+    if args.spectate or args.record or args.replay:
+        run_spectator_server(record_path=args.record, replay_path=args.replay, metrics_port=args.metrics_port)
+    else:
+        run_server(metrics_port=args.metrics_port)
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""Behavioural consistency checks for the optional simulation modes.
+
+Each check runs a deterministic scenario against the offline LLM stand-in and
+reports the number of mismatches; the run fails if any check finds one.
+
+    python consistency_checks.py              # run every check
+    python consistency_checks.py shard_records
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from agents import Crewmate, Imposter
+from events import EventLogger, INFO, SILENT
+from model import AmongUsModel
+from suspicion import record_covisibility
+
+
+def make_model(num_agents, num_imposters=1, seed=0, **kwargs):
+    return AmongUsModel(
+        num_agents=num_agents, num_imposters=num_imposters, llm_type="offline", seed=seed,
+        log_level=SILENT, **kwargs
+    )
+
+
+def visible_players(model, agent):
+    return [
+        a.unique_id
+        for a in model.grid.get_neighbors(agent.pos, moore=True, radius=agent.visibility, include_center=True)
+        if a is not agent and isinstance(a, (Crewmate, Imposter))
+    ]
+
+
+def check_shard_neighbours(steps=30):
+    """Shard answers match MultiGrid.get_neighbors and the serial isolation check"""
+    model = make_model(40, 3, seed=5, num_shards=4)
+    mismatches = 0
+    try:
+        for _ in range(steps):
+            if model.phase != "tasks":
+                break
+            model.shards.publish(model.schedule.agents, lambda a: isinstance(a, Imposter))
+            visible = model.shards.query("crewmates")
+            targets = model.shards.query("imposters")
+            for agent in model.schedule.agents:
+                if not agent.alive:
+                    continue
+                if isinstance(agent, Crewmate):
+                    mismatches += sorted(visible_players(model, agent)) != sorted(visible[agent.unique_id])
+                else:
+                    found = agent.find_isolated_agent()
+                    mismatches += (found.unique_id if found else None) not in (targets[agent.unique_id] or [None])
+            model.sharded_step()
+    finally:
+        model.close()
+    return mismatches
+
+
+def check_shard_records(steps=60):
+    """Suspicion records kept by the shards match a serial replay of the same ticks.
+
+    Five narrow bands with no slack make crewmates cross shards, so records
+    and traces migrate between workers.
+    """
+    model = make_model(40, 2, seed=3, num_shards=5)
+    model.shards.layout.slack = 0  # Workers still read the wider rows they were started with
+    shadow = {}
+    try:
+        while model.running and model.schedule.steps < steps:
+            step = model.schedule.steps
+            model.step()
+            if model.schedule.steps == step:
+                continue  # Meeting tick: nobody observed
+            for agent in model.schedule.agents:
+                if isinstance(agent, Crewmate) and agent.alive:
+                    record_covisibility(
+                        shadow.setdefault(agent.unique_id, {}), visible_players(model, agent),
+                        model.get_room(agent.pos), step, model.suspicion_window
+                    )
+    finally:
+        model.close()  # Copies the shards' records back onto the crewmates
+    mismatches = 0
+    for agent in model.schedule.agents:
+        if isinstance(agent, Crewmate):
+            expected = {pair: r.to_prompt() for pair, r in shadow.get(agent.unique_id, {}).items()}
+            actual = {pair: r.to_prompt() for pair, r in agent.suspicion_pairs.items()}
+            mismatches += expected != actual
+    return mismatches
+
+
+def kill_distances(model, max_steps=200):
+    """Play ``model`` to the end; Chebyshev distance between imposter and victim for every kill"""
+    distances = []
+    for imposter in model.schedule.agents:
+        if isinstance(imposter, Imposter):
+            def kill(target, imposter=imposter, kill=imposter.kill):
+                (x, y), (tx, ty) = imposter.pos, target.pos
+                kill(target)
+                if not target.alive:
+                    distances.append(max(abs(x - tx), abs(y - ty)))
+            imposter.kill = kill
+    try:
+        while model.running and model.schedule.steps < max_steps:
+            model.step()
+    finally:
+        model.close()
+    return distances
+
+
+def check_kill_distance(games=10):
+    """Every kill, in every activation mode, is of a crewmate adjacent to the imposter"""
+    mismatches = 0
+    for kwargs in ({}, {"activation": "simultaneous"}, {"num_shards": 2}):
+        for seed in range(games):
+            distances = kill_distances(make_model(40, 3, seed=seed, **kwargs))
+            mismatches += sum(d != 1 for d in distances)
+    return mismatches
+
+
+def meeting_votes(model):
+    """Play ``model`` to the end; yields (voter, suspect, reason, freshly queried) per meeting vote"""
+    stream = io.StringIO()
+    model.log = model.llm.log = EventLogger(level=INFO, stream=stream, fmt="json", background=False)
+    while model.running and model.schedule.steps < 300:
+        model.step()
+    model.close()
+    queried = set()
+    for line in stream.getvalue().splitlines():
+        event = json.loads(line)
+        if event["kind"] == "argument":
+            queried.add(event["agent"])
+        elif event["kind"] == "vote" and "voter" in event:
+            reason = event["message"].partition(" reasoning: ")[2]
+            yield event["voter"], event["suspect"], reason, event["voter"] in queried
+        elif event["kind"] == "tally":
+            queried = set()
+
+
+def check_dedup_votes(games=8):
+    """Reused meeting arguments never make an agent vote for itself, and resampling can pick imposters"""
+    mismatches = 0
+    sampled_imposter_votes = 0
+    for dedup in ("shared", "sampled"):
+        for seed in range(games):
+            model = make_model(20, 2, seed=seed, dedup=dedup)
+            imposters = {a.unique_id for a in model.schedule.agents if isinstance(a, Imposter)}
+            for voter, suspect, reason, queried in meeting_votes(model):
+                mismatches += voter == suspect and not queried
+                if reason == "Sampled from shared argument":
+                    sampled_imposter_votes += suspect in imposters
+    return mismatches + (sampled_imposter_votes == 0)
+
+
+CHECKS = {
+    "shard_neighbours": check_shard_neighbours,
+    "shard_records": check_shard_records,
+    "dedup_votes": check_dedup_votes,
+    "kill_distance": check_kill_distance,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation consistency checks")
+    parser.add_argument("checks", nargs="*", help="Run only these checks")
+    args = parser.parse_args()
+
+    failed = []
+    workdir = os.getcwd()
+    # Trace logs go to a scratch directory; model output is discarded
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for name, check in CHECKS.items():
+                if args.checks and name not in args.checks:
+                    continue
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    mismatches = check()
+                print(f"{name}: {mismatches} mismatches")
+                if mismatches:
+                    failed.append(name)
+        finally:
+            os.chdir(workdir)
+    if failed:
+        print(f"Failed checks: {', '.join(failed)}")
+        return 1
+    print("All checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+
+DEBUG, INFO, WARNING, ERROR, SILENT = 10, 20, 30, 40, 100
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+
+class _BackgroundWriter:
+    """One shared thread that writes queued log lines, so callers never block on I/O"""
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _run(self):
+        while True:
+            stream, text = self._queue.get()
+            try:
+                stream.write(text)
+                if self._queue.empty():
+                    stream.flush()
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def write(self, stream, text):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put((stream, text))
+
+    def flush(self):
+        """Block until every queued line has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+
+_writer = _BackgroundWriter()
+atexit.register(_writer.flush)
+
+
+class EventLogger:
+    """Leveled game event log.
+
+    Each event has a level, a ``kind`` (e.g. ``"kill"``, ``"vote"``) and
+    %-style message arguments, plus optional structured fields. Events below
+    ``level`` return before any formatting, so SILENT costs one comparison.
+    With ``fmt="json"`` events are written as JSON lines instead of text.
+    """
+    def __init__(self, level=INFO, stream=None, fmt="text", background=True):
+        self.level = level
+        self.stream = stream or sys.stdout
+        self.fmt = fmt
+        self.background = background
+
+    def is_enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, kind, message, *args, **fields):
+        if level < self.level:
+            return
+        text = message % args if args else message
+        if self.fmt == "json":
+            line = json.dumps({
+                "time": time.time(), "level": LEVEL_NAMES.get(level, level),
+                "kind": kind, "message": text, **fields
+            }, default=str) + "\n"
+        else:
+            line = text + "\n"
+        if self.background:
+            _writer.write(self.stream, line)
+        else:
+            self.stream.write(line)
+
+    def debug(self, kind, message, *args, **fields):
+        if DEBUG >= self.level:
+            self.log(DEBUG, kind, message, *args, **fields)
+
+    def info(self, kind, message, *args, **fields):
+        if INFO >= self.level:
+            self.log(INFO, kind, message, *args, **fields)
+
+    def warning(self, kind, message, *args, **fields):
+        if WARNING >= self.level:
+            self.log(WARNING, kind, message, *args, **fields)
+
+    def error(self, kind, message, *args, **fields):
+        if ERROR >= self.level:
+            self.log(ERROR, kind, message, *args, **fields)
+
+    def flush(self):
+        if self.background:
+            _writer.flush()
+        else:
+            self.stream.flush()
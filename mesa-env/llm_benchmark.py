@@ -2,14 +2,30 @@ from abc import ABC, abstractmethod
 import json
 import re
 import random
+import metrics
+from events import EventLogger, WARNING
 
 class LLMAdapter(ABC):
+    # USD per 1k (prompt, completion) tokens; override per loader or instance
+    price_per_1k = (0.0, 0.0)
+    # (prompt_tokens, completion_tokens) of the most recent query_llm call
+    last_usage = (0, 0)
+    # Parse fallbacks and API errors go here; AmongUsModel swaps in its own event log
+    log = EventLogger(level=WARNING)
+
     @abstractmethod
     def query_llm(self, prompt: str, system_message: str = None) -> str:
         pass
 
     @staticmethod
-    def parse_response(response: str) -> dict:
+    def estimate_tokens(text: str) -> int:
+        """Rough token count (~4 characters per token) when the API reports none"""
+        return len(text) // 4 + 1 if text else 0
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.price_per_1k[0] + completion_tokens * self.price_per_1k[1]) / 1000
+
+    def parse_response(self, response: str) -> dict:
         try:
             # Handle Gemini's weird array responses
             if response.startswith('['):
@@ -29,7 +45,8 @@ class LLMAdapter(ABC):
                 "confidence": parsed.get("confidence", 50)
             }
         except Exception as e:
-            print(f"Final fallback parsing for: {response}")
+            metrics.LLM_PARSE_FALLBACKS.inc()
+            self.log.warning("llm_parse_fallback", "Final fallback parsing for: %s", response)
             # Robust regex extraction
             suspect = re.findall(r'\b\d+\b', response)
             return {
@@ -39,6 +56,8 @@ class LLMAdapter(ABC):
             }
 
 class OpenAILoader(LLMAdapter):
+    price_per_1k = (0.0005, 0.0015)
+
     def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
         from openai import OpenAI
         self.client = OpenAI(api_key=api_key)
@@ -56,12 +75,21 @@ class OpenAILoader(LLMAdapter):
                 temperature=0.7,
                 max_tokens=150
             )
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            if usage:
+                self.last_usage = (usage.prompt_tokens, usage.completion_tokens)
+            else:
+                self.last_usage = (self.estimate_tokens(f"{system_message or ''}{prompt}"), self.estimate_tokens(content))
+            return content
         except Exception as e:
-            print(f"OpenAI API error: {str(e)}")
+            self.last_usage = (self.estimate_tokens(f"{system_message or ''}{prompt}"), 0)
+            self.log.error("llm_error", "OpenAI API error: %s", e)
             return None
 
 class GeminiLoader(LLMAdapter):
+    price_per_1k = (0.0001, 0.0004)
+
     def __init__(self, api_key: str):
         import google.generativeai as genai
         genai.configure(api_key=api_key)
@@ -72,11 +100,39 @@ class GeminiLoader(LLMAdapter):
             full_prompt = f"{system_message}\n\n{prompt}" if system_message else prompt
             # Add explicit JSON formatting instructions
             json_instructions = "Respond with a valid JSON object containing 'suspect' (as a number), 'reason' (as a string), and 'confidence' (as a number between 0-100)."
+            full_prompt = f"{json_instructions}\n\n{full_prompt}"
             response = self.model.generate_content(
-                f"{json_instructions}\n\n{full_prompt}",
+                full_prompt,
                 generation_config={"temperature": 0.7, "max_output_tokens": 200}
             )
+            usage = getattr(response, "usage_metadata", None)
+            if usage:
+                self.last_usage = (usage.prompt_token_count, usage.candidates_token_count)
+            else:
+                self.last_usage = (self.estimate_tokens(full_prompt), self.estimate_tokens(response.text))
             return response.text
         except Exception as e:
-            print(f"Gemini API error: {str(e)}")
-            return None
\ No newline at end of file
+            self.last_usage = (self.estimate_tokens(f"{system_message or ''}{prompt}"), 0)
+            self.log.error("llm_error", "Gemini API error: %s", e)
+            return None
+
+class OfflineLoader(LLMAdapter):
+    """Deterministic stand-in for benchmarks and offline runs (no API calls)"""
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def query_llm(self, prompt: str, system_message: str = None) -> str:
+        # Same prompt always yields the same answer
+        rng = random.Random(f"{self.seed}:{prompt}")
+        candidates = re.findall(r'Agent (\d+)', prompt)
+        crewmates = re.search(r'Alive Crewmates: \[([\d, ]*)\]', prompt)
+        if crewmates:
+            candidates += re.findall(r'\d+', crewmates.group(1))
+        suspect = int(rng.choice(candidates)) if candidates else rng.randint(1, 10)
+        response = json.dumps({
+            "suspect": suspect,
+            "reason": "Offline heuristic",
+            "confidence": rng.randint(0, 100)
+        })
+        self.last_usage = (self.estimate_tokens(f"{system_message or ''}{prompt}"), self.estimate_tokens(response))
+        return response
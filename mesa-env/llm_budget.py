@@ -0,0 +1,97 @@
+FULL, SHORT, HEURISTIC = "full", "short", "heuristic"
+
+
+class TokenLedger:
+    """Token, cost and latency totals for LLM calls, per agent and per meeting"""
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latency = 0.0
+        self.by_agent = {}    # agent_id -> [prompt_tokens, completion_tokens, cost]
+        self.by_meeting = {}  # meeting number -> [prompt_tokens, completion_tokens, cost]
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def record(self, agent_id, meeting, prompt_tokens, completion_tokens, cost, latency=0.0):
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost += cost
+        self.latency += latency
+        for key, table in ((agent_id, self.by_agent), (meeting, self.by_meeting)):
+            totals = table.setdefault(key, [0, 0, 0.0])
+            totals[0] += prompt_tokens
+            totals[1] += completion_tokens
+            totals[2] += cost
+
+    def merge(self, other):
+        """Add another ledger's totals (e.g. one game into a sweep)"""
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost += other.cost
+        self.latency += other.latency
+
+    @classmethod
+    def from_summary(cls, summary):
+        """Ledger with the totals of a ``summary()`` dict (per-agent and per-meeting tables are empty)"""
+        ledger = cls()
+        for key, value in summary.items():
+            setattr(ledger, key, value)
+        return ledger
+
+    def summary(self):
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": self.cost,
+            "latency": self.latency,
+        }
+
+
+class BudgetScheduler:
+    """Decide before each meeting which agents get a full, short or no LLM call.
+
+    Per-call token estimates start from ``default_call_tokens`` and follow the
+    running average of the calls actually made. Agents get full calls while the
+    remaining budget covers them, then short prompts, then the heuristic vote.
+    Agents are served in a random order, so no role or seat always loses its
+    call first when the budget runs short.
+    """
+    def __init__(self, budget_tokens, default_call_tokens=600, short_ratio=0.4):
+        self.budget_tokens = budget_tokens
+        self._estimates = {
+            FULL: [default_call_tokens, 0],
+            SHORT: [default_call_tokens * short_ratio, 0],
+        }
+
+    def estimate(self, mode):
+        return self._estimates[mode][0]
+
+    def observe(self, mode, tokens):
+        """Update the running per-call estimate for ``mode``"""
+        estimate = self._estimates[mode]
+        estimate[1] += 1
+        estimate[0] += (tokens - estimate[0]) / estimate[1]
+
+    def plan(self, agent_ids, ledger, rng):
+        """Return {agent_id: FULL | SHORT | HEURISTIC} for the coming meeting, serving agents in ``rng`` order"""
+        remaining = self.budget_tokens - ledger.total_tokens
+        order = list(agent_ids)
+        rng.shuffle(order)
+        plan = {}
+        for agent_id in order:
+            if remaining >= self.estimate(FULL):
+                plan[agent_id] = FULL
+                remaining -= self.estimate(FULL)
+            elif remaining >= self.estimate(SHORT):
+                plan[agent_id] = SHORT
+                remaining -= self.estimate(SHORT)
+            else:
+                plan[agent_id] = HEURISTIC
+        return plan
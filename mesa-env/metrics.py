@@ -0,0 +1,152 @@
+"""Process-wide simulation metrics, served in Prometheus text format.
+
+    start_metrics_server(9100)   # then scrape http://127.0.0.1:9100/metrics
+"""
+import os
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter",
+                f"{self.name} {self.value}"]
+
+
+class Gauge:
+    """A settable gauge, or one computed on each scrape when ``fn`` is given"""
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.fn = fn
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+    def render(self):
+        value = self.fn() if self.fn else self.value
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {value}"]
+
+
+class Summary:
+    """Count, sum and quantiles over the most recent ``window`` observations"""
+    def __init__(self, name, help_text, quantiles=(0.5, 0.9, 0.99), window=1000):
+        self.name = name
+        self.help = help_text
+        self.quantiles = quantiles
+        self.count = 0
+        self.sum = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self._recent.append(value)
+
+    def render(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total = self.count, self.sum
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} summary"]
+        for q in self.quantiles:
+            value = recent[min(len(recent) - 1, int(q * len(recent)))] if recent else "NaN"
+            lines.append(f'{self.name}{{quantile="{q}"}} {value}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _resident_bytes():
+    """Current resident memory, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+REGISTRY = Registry()
+GAMES_COMPLETED = REGISTRY.register(Counter("amongus_games_completed_total", "Games played to game over or a step limit"))
+# Step rate is left to the scraper (e.g. rate(amongus_steps_total[1m])), so any number of scrapers agree
+STEPS = REGISTRY.register(Counter("amongus_steps_total", "Model steps executed"))
+MEETINGS_IN_FLIGHT = REGISTRY.register(Gauge("amongus_meetings_in_flight", "Games currently in discussion or voting"))
+LLM_REQUESTS = REGISTRY.register(Counter("amongus_llm_requests_total", "LLM queries sent"))
+LLM_LATENCY = REGISTRY.register(Summary("amongus_llm_latency_seconds", "LLM query latency"))
+LLM_PARSE_FALLBACKS = REGISTRY.register(Counter(
+    "amongus_llm_parse_fallbacks_total", "LLM responses that needed regex fallback parsing"
+))
+REGISTRY.register(Gauge(
+    "amongus_llm_parse_fallback_ratio", "Share of LLM responses that needed fallback parsing",
+    lambda: LLM_PARSE_FALLBACKS.value / LLM_REQUESTS.value if LLM_REQUESTS.value else 0.0
+))
+LLM_DEDUP_HITS = REGISTRY.register(Counter(
+    "amongus_llm_dedup_hits_total", "Meeting arguments reused from an agent with equivalent evidence"
+))
+REGISTRY.register(Gauge(
+    "amongus_llm_dedup_hit_ratio", "Share of LLM-backed meeting arguments served without a new query",
+    lambda: LLM_DEDUP_HITS.value / (LLM_DEDUP_HITS.value + LLM_REQUESTS.value)
+    if LLM_DEDUP_HITS.value + LLM_REQUESTS.value else 0.0
+))
+REGISTRY.register(Gauge(
+    "process_resident_memory_bytes", "Current resident memory of this process", _resident_bytes
+))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the simulation output
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the HTTP server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
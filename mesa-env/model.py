@@ -3,31 +3,47 @@ from mesa.time import RandomActivation
 from mesa.space import MultiGrid
 from agents import Crewmate, Imposter
 from call_label_agent import CellLabelAgent
-from llm_benchmark import OpenAILoader, GeminiLoader
-import random
+from suspicion import format_suspicions, canonical_evidence
+from sharding import ShardPool
+from occupancy import OccupancyMap, RoomIndex
+from events import EventLogger, DEBUG, INFO
+from llm_budget import TokenLedger, BudgetScheduler, FULL, SHORT, HEURISTIC
+from llm_benchmark import OpenAILoader, GeminiLoader, OfflineLoader
+import metrics
 import json
 import os
 from dotenv import load_dotenv
 import re
+import time
 
 class AmongUsModel(Model):
-    def __init__(self, width=20, height=20, num_agents=10, num_imposters=1, llm_type="gemini", openai_model="gemini-2.0-flash"):
+    def __init__(self, width=20, height=20, num_agents=10, num_imposters=1, llm_type="gemini", openai_model="gemini-2.0-flash", suspicion_window=50, num_shards=0, seed=None, token_budget=None, log_level=INFO, activation="random", dedup="off"):
         super().__init__()
+        self.log = EventLogger(level=log_level)
+        # Base of the per-agent RNG streams; drawn from the model RNG so unseeded games differ
+        self.agent_seed = self.random.getrandbits(64)
         # Load environment variables
         load_dotenv()
         
         # Initialize LLM
-        if llm_type == "openai":
-            self.llm = OpenAILoader(os.getenv("OPENAI_KEY"), model=openai_model)
-        elif llm_type == "gemini":
-            self.llm = GeminiLoader(os.getenv("GEMINI_KEY"))
-        else:
-            raise ValueError(f"Unsupported LLM type: {llm_type}")
+        self.llm_args = (llm_type, openai_model, seed)
+        self.llm = self.make_llm(*self.llm_args)
+        self.llm.log = self.log
         
         # Load standardized prompts
-        with open("prompts.json") as f:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts.json")) as f:
             self.prompts = json.load(f)
 
+        if activation not in ("random", "simultaneous"):
+            raise ValueError(f"Unsupported activation: {activation}")
+        self.activation = activation
+
+        # Meeting arguments shared between agents with equivalent evidence:
+        # "off", "shared" (same answer) or "sampled" (each agent draws from it)
+        if dedup not in ("off", "shared", "sampled"):
+            raise ValueError(f"Unsupported dedup: {dedup}")
+        self.dedup = dedup
+
         self.grid = MultiGrid(width, height, torus=False)
         self.schedule = RandomActivation(self)
         self.num_agents = num_agents
@@ -36,8 +52,18 @@ class AmongUsModel(Model):
         self.reported_body = None
         self.votes = {}
         self.game_over = False  # New game state flag
+        self.in_meeting = False  # Counted in metrics.MEETINGS_IN_FLIGHT
+        self.closed = False
         self.winner = None  # "Crewmates" or "Imposter"
         self.running = True  # New game state flag
+        self.imposters_ejected = 0
+        self.crewmates_ejected = 0
+        self.suspicion_window = suspicion_window  # Steps of room history kept per pair
+
+        # LLM token/cost accounting and optional per-game token budget
+        self.ledger = TokenLedger()
+        self.budget = BudgetScheduler(token_budget) if token_budget else None
+        self.meetings = 0
         
         # Define rooms and hallways
         self.rooms = [
@@ -50,15 +76,29 @@ class AmongUsModel(Model):
             (3, 9, 6, 10, "Hallway"),
             (13, 9, 16, 10, "Hallway")      
         ]
+
+        # One task per main room, at the room centre
+        self.task_specs = [
+            (room[4], ((room[0] + room[2]) // 2, (room[1] + room[3]) // 2))
+            for room in self.rooms if room[4] != "Hallway"
+        ]
+
+        # Player positions for isolation checks, plus static low-traffic cells
+        self.occupancy = OccupancyMap(width, height, self.rooms, [
+            location for _, location in self.task_specs
+        ])
+        self.room_index = RoomIndex(self.rooms)
         
         # Initialize agents with room-specific tasks
         for _ in range(num_agents):
             agent = Crewmate(self.next_id(), self)
             self.schedule.add(agent)
-            room = random.choice(self.rooms[:4])  # Only place in main rooms
-            x = random.randint(room[0], room[2])
-            y = random.randint(room[1], room[3])
+            room = self.random.choice(self.rooms[:4])  # Only place in main rooms
+            x = self.random.randint(room[0], room[2])
+            y = self.random.randint(room[1], room[3])
             self.grid.place_agent(agent, (x, y))
+            self.occupancy.place(agent, (x, y))
+            self.room_index.enter(agent, (x, y), 0)
             # Assign tasks within the same room
             # agent.tasks = [
             #     Task(f"{room[4]} Task 1", (random.randint(room[0], room[2]), random.randint(room[1], room[3]))),
@@ -68,14 +108,17 @@ class AmongUsModel(Model):
         for _ in range(num_imposters):
             agent = Imposter(self.next_id(), self)
             self.schedule.add(agent)
-            room = random.choice(self.rooms[:4])  # Only place in main rooms
-            x = random.randint(room[0], room[2])
-            y = random.randint(room[1], room[3])
+            room = self.random.choice(self.rooms[:4])  # Only place in main rooms
+            x = self.random.randint(room[0], room[2])
+            y = self.random.randint(room[1], room[3])
             self.grid.place_agent(agent, (x, y))
-            # Fake task in a random room
-            fake_room = random.choice(self.rooms[:4])
-            # agent.fake_tasks = [Task("Fake Task", (random.randint(fake_room[0], fake_room[2]), random.randint(fake_room[1], fake_room[3])))]
+            self.occupancy.place(agent, (x, y))
+            self.room_index.enter(agent, (x, y), 0)
+            # The fake task room is no longer used; still drawn so seeded games replay unchanged
+            self.random.choice(self.rooms[:4])
         
+        self.player_ids = frozenset(a.unique_id for a in self.schedule.agents)
+
         # Initialize room labels
         for i, room in enumerate(self.rooms):
             for x in range(room[0], room[2]+1):
@@ -88,27 +131,127 @@ class AmongUsModel(Model):
                     )
                     self.grid.place_agent(label_agent, (x, y))
 
-    def generate_argument(self, agent, context):
+        # Optional worker processes for neighbourhood queries on large maps
+        self.num_shards = num_shards
+        self.shards = None
+        if num_shards > 1:
+            self.shards = ShardPool(self, num_shards, crewmate_visibility=6, imposter_visibility=9)
+
+    @staticmethod
+    def make_llm(llm_type, openai_model, seed):
+        if llm_type == "openai":
+            return OpenAILoader(os.getenv("OPENAI_KEY"), model=openai_model)
+        elif llm_type == "gemini":
+            return GeminiLoader(os.getenv("GEMINI_KEY"))
+        elif llm_type == "offline":
+            return OfflineLoader(seed if seed is not None else 0)
+        raise ValueError(f"Unsupported LLM type: {llm_type}")
+
+    def __getstate__(self):
+        """Pickle support for sweep snapshots, taken between meetings.
+
+        The LLM client, event log stream and shard workers cannot be pickled;
+        they are rebuilt on load.
+        """
+        if self.shards:
+            self.sync_suspicions()
+        state = self.__dict__.copy()
+        state["llm"] = None
+        state["log"] = (self.log.level, self.log.fmt)
+        state["shards"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        level, fmt = state["log"]
+        self.log = EventLogger(level=level, fmt=fmt)
+        self.llm = self.make_llm(*self.llm_args)
+        self.llm.log = self.log
+        if self.num_shards > 1:
+            self.shards = ShardPool(self, self.num_shards, crewmate_visibility=6, imposter_visibility=9)
+
+    def generate_argument(self, agent, context, short=False):
         role = "imposter" if isinstance(agent, Imposter) else "crewmate"
         try:
+            trace_content = context.get('trace_content', '')
+            dead_suspicions = context.get('dead_suspicions', {})
+            if short:
+                # Shortened prompt when the token budget is running low
+                trace_content = trace_content[-250:]
+                dead_suspicions = "\n".join(str(dead_suspicions).splitlines()[:5])
+
             # Format the prompt template with safe defaults
             prompt_template = self.prompts[role]["user"].format(
-                trace_content=context.get('trace_content', ''),
+                trace_content=trace_content,
                 dead_agent_id=context.get('dead_agent_id', 'Unknown'),
                 death_location=context.get('death_location', 'Unknown'),
-                dead_suspicions=context.get('dead_suspicions', {}),
-                alive_crewmates=context.get('alive_crewmates', [])
+                dead_suspicions=dead_suspicions,
+                alive_crewmates=context.get('alive_crewmates', []),
+                room_occupants=context.get('room_occupants', []),
+                room_transitions=context.get('room_transitions', {}),
+                hallway_loitering=context.get('hallway_loitering', {})
             )
             system_msg = self.prompts[role]["system"]
             
+            start = time.perf_counter()
             response = self.llm.query_llm(prompt_template, system_msg)
+            latency = time.perf_counter() - start
+            metrics.LLM_REQUESTS.inc()
+            metrics.LLM_LATENCY.observe(latency)
+            prompt_tokens, completion_tokens = self.llm.last_usage
+            self.ledger.record(
+                agent.unique_id, self.meetings, prompt_tokens, completion_tokens,
+                self.llm.cost(prompt_tokens, completion_tokens), latency
+            )
+            if self.budget:
+                self.budget.observe(SHORT if short else FULL, prompt_tokens + completion_tokens)
             parsed_response = self.llm.parse_response(response)
             if parsed_response:
-                print(f"Agent {agent.unique_id} argument: {parsed_response}")
+                self.log.info("argument", "Agent %s argument: %s", agent.unique_id, parsed_response,
+                              agent=agent.unique_id)
             return parsed_response
         except Exception as e:
             return None
 
+    @staticmethod
+    def suspect_of(argument):
+        """Agent id an argument names as its suspect, or None"""
+        match = re.search(r'\d+', str(argument.get("suspect", "")))
+        return int(match.group()) if match else None
+
+    def sample_argument(self, agent, argument, candidates):
+        """Draw an agent's own suspect from a shared argument.
+
+        The shared suspect is kept with probability ``confidence``%; otherwise
+        (and always when the shared suspect is the agent itself) the agent
+        picks another alive player from ``candidates`` with its own RNG stream.
+        Returns None if there is nobody else to pick.
+        """
+        try:
+            confidence = float(argument.get("confidence", 50)) / 100
+        except (TypeError, ValueError):
+            confidence = 0.5
+        suspect = self.suspect_of(argument)
+        others = [c for c in candidates if c != agent.unique_id and c != suspect]
+        if suspect != agent.unique_id and (not others or agent.rng.random() < confidence):
+            return argument
+        if not others:
+            return None
+        return {**argument, "suspect": agent.rng.choice(others), "reason": "Sampled from shared argument"}
+
+    def move_agent(self, agent, pos, transition=True):
+        """Move a player on the grid and keep the occupancy map and room index in sync"""
+        self.occupancy.move(agent, agent.pos, pos)
+        self.room_index.move(agent, pos, self.schedule.steps, transition)
+        self.grid.move_agent(agent, pos)
+
+    def remove_agent(self, agent):
+        """Remove a player from the grid, the occupancy map, the room index and the schedule"""
+        self.occupancy.remove(agent, agent.pos)
+        self.room_index.leave(agent)
+        self.grid.remove_agent(agent)
+        self.schedule.remove(agent)
+
     def is_valid_position(self, pos):
         """Check if position has a CellLabelAgent (valid room/hallway)"""
         x, y = pos
@@ -120,45 +263,61 @@ class AmongUsModel(Model):
     
     def get_room(self, pos):
         """Return the room name for a given position"""
-        x, y = pos
-        for room in self.rooms:
-            if room[0] <= x <= room[2] and room[1] <= y <= room[3]:
-                return room[4]
-        return "Hallway"
+        return self.room_index.room_of(pos)
     
     def discussion_step(self):
         """Process discussion phase with LLM integration"""
         self.votes = {}
+        if self.shards:
+            self.sync_suspicions()
 
         # Find dead agent with error handling
         try:
             dead_agent = next(a for a in self.schedule.agents 
                             if a.pos == self.reported_body and not a.alive)
         except StopIteration:
-            print("No dead agent found! Resetting round.")
+            self.log.warning("no_body", "No dead agent found! Resetting round.")
             self.reset_round()
             return
 
-        # Capture death location BEFORE removal
+        # Capture death location and who shares the room BEFORE removal
         death_location = self.get_room(dead_agent.pos)
+        room_occupants = sorted(
+            a.unique_id for a in self.room_index.alive_in(death_location)
+        )
 
         # Remove dead agent properly
         try:
-            self.grid.remove_agent(dead_agent)
-            self.schedule.remove(dead_agent)
+            self.remove_agent(dead_agent)
             if isinstance(dead_agent, Crewmate):
                 dead_agent.close_trace_file()
         except Exception as e:
-            print(f"Error removing dead agent: {e}")
+            self.log.error("error", "Error removing dead agent: %s", e)
 
         # Prepare context for LLM
         context = {
             'dead_agent_id': dead_agent.unique_id,
             'death_location': death_location,
-            'dead_suspicions': dead_agent.suspicion_pairs if isinstance(dead_agent, Crewmate) else {},
+            'dead_suspicions': format_suspicions(
+                dead_agent.suspicion_pairs, self.schedule.steps, self.suspicion_window
+            ) if isinstance(dead_agent, Crewmate) else "None",
             'alive_crewmates': [a.unique_id for a in self.schedule.agents 
-                              if isinstance(a, Crewmate) and a.alive]
+                              if isinstance(a, Crewmate) and a.alive],
+            'room_occupants': room_occupants,
+            'room_transitions': {
+                a.unique_id: self.room_index.transitions.get(a.unique_id, 0)
+                for a in self.schedule.agents if a.alive
+            },
+            'hallway_loitering': self.room_index.loitering(self.schedule.steps, min_steps=5)
         }
+        self.meetings += 1
+
+        # Decide who gets a full LLM call, a short prompt or the heuristic vote
+        candidates = [a.unique_id for a in self.schedule.agents if a.alive]
+        plan = self.budget.plan(candidates, self.ledger, self.random) if self.budget else {}
+
+        # One LLM query per group of agents with equivalent evidence (if enabled)
+        shared_arguments = {}
 
         # Collect arguments and votes from all alive agents
         for agent in self.schedule.agents:
@@ -178,64 +337,93 @@ class AmongUsModel(Model):
                 context['trace_content'] = trace_content
 
                 # Generate argument using the new method
-                argument = self.generate_argument(agent, context)
+                mode = plan.get(agent.unique_id, FULL)
+                if mode == HEURISTIC:
+                    argument = agent.heuristic_argument(context, candidates)
+                elif self.dedup != "off":
+                    evidence = canonical_evidence(
+                        trace_content[-250:] if mode == SHORT else trace_content,
+                        self.player_ids, agent.unique_id
+                    )
+                    key = (type(agent), mode, evidence)
+                    shared = shared_arguments.get(key)
+                    argument = None
+                    if shared is not None and self.dedup == "sampled":
+                        argument = self.sample_argument(agent, shared, candidates)
+                    elif shared is not None and self.suspect_of(shared) != agent.unique_id:
+                        argument = shared
+                    if argument is None:
+                        # No equivalent evidence yet, or the shared answer accuses this agent
+                        argument = self.generate_argument(agent, context, short=(mode == SHORT))
+                        if argument and shared is None:
+                            shared_arguments[key] = argument
+                    else:
+                        metrics.LLM_DEDUP_HITS.inc()
+                else:
+                    argument = self.generate_argument(agent, context, short=(mode == SHORT))
 
                 # Process the argument
                 if argument and "suspect" in argument:
-                    print(f"Raw argument from Agent {agent.unique_id}: {argument}")  # Debug raw argument
+                    self.log.debug("vote", "Raw argument from Agent %s: %s", agent.unique_id, argument)
                     # Handle numeric extraction safely
                     suspect_str = str(argument["suspect"]).strip()
-                    print(f"Suspect string before processing: '{suspect_str}'")  # Debug suspect string
+                    self.log.debug("vote", "Suspect string before processing: '%s'", suspect_str)
                     try:
                         match = re.search(r'\d+', suspect_str)
                         if match:
                             suspect_id = int(match.group())
-                            print(f"Found suspect ID: {suspect_id}")  # Debug found ID
+                            self.log.debug("vote", "Found suspect ID: %s", suspect_id)
                         else:
-                            print(f"No number found in suspect string: '{suspect_str}'")  # Debug no match
+                            self.log.debug("vote", "No number found in suspect string: '%s'", suspect_str)
                             suspect_id = -1
                     except Exception as e:
-                        print(f"Error extracting suspect ID: {str(e)}")  # Debug extraction error
+                        self.log.debug("vote", "Error extracting suspect ID: %s", e)
                         suspect_id = -1
 
                     if suspect_id != -1 and any(a.unique_id == suspect_id for a in self.schedule.agents if a.alive):
                         self.votes[suspect_id] = self.votes.get(suspect_id, 0) + 1
-                        print(f"Agent {agent.unique_id} reasoning: {argument.get('reason', 'No reason provided')}")
+                        self.log.info("vote", "Agent %s reasoning: %s", agent.unique_id,
+                                      argument.get('reason', 'No reason provided'),
+                                      voter=agent.unique_id, suspect=suspect_id)
                     else:
-                        print(f"Invalid suspect ID from Agent {agent.unique_id}: {suspect_str} (ID: {suspect_id})")
+                        self.log.warning("invalid_vote", "Invalid suspect ID from Agent %s: %s (ID: %s)",
+                                         agent.unique_id, suspect_str, suspect_id, voter=agent.unique_id)
 
             except Exception as e:
-                print(f"Error processing agent {agent.unique_id}: {str(e)}")
-                print(f"Full error details: {type(e).__name__}: {str(e)}")  # Debug full error
-                import traceback
-                print(f"Traceback: {traceback.format_exc()}")  # Debug traceback
+                self.log.error("error", "Error processing agent %s: %s", agent.unique_id, e)
+                if self.log.is_enabled(DEBUG):
+                    import traceback
+                    self.log.debug("error", "Traceback: %s", traceback.format_exc())
 
         self.phase = "voting"
         self.discussion_time = 5
-        print(f"Voting tally: {self.votes}")
+        self.log.info("tally", "Voting tally: %s", self.votes, votes=self.votes)
 
     def reset_round(self):
         """Reset round and clear voting data"""
         self.phase = "tasks"
         self.reported_body = None
         self.votes = {}  # Now resetting votes each round
+        if self.in_meeting:
+            self.in_meeting = False
+            metrics.MEETINGS_IN_FLIGHT.dec()
         self.discussion_time = 0
+        if self.shards:
+            self.shards.reset()
         # Cleanup dead agents (safety net)
         for agent in self.schedule.agents:
-            if isinstance(agent, Crewmate) and hasattr(agent, '_trace_file'):
-                agent._trace_file.close()
-                del agent._trace_file  # Ensures re-initialization next round
+            if isinstance(agent, Crewmate):
+                agent.close_trace_file()  # Ensures re-initialization next round
 
         for agent in list(self.schedule.agents):  # Use list() to avoid iteration issues
             if not agent.alive:
-                self.grid.remove_agent(agent)
-                self.schedule.remove(agent)
+                self.remove_agent(agent)
             
 
     def tally_votes(self):
         """Eject most-voted agent with proper tie-breaking"""
         if not self.votes:
-            print("No votes cast! Skipping to next round.")
+            self.log.info("no_votes", "No votes cast! Skipping to next round.")
             self.reset_round()
             return
         
@@ -249,24 +437,122 @@ class AmongUsModel(Model):
         for agent in self.schedule.agents:
             if agent.unique_id == ejected_id:
                 agent.alive = False
-                # Move ejected agent to a corner for visual indication
-                self.grid.move_agent(agent, (0, 0))
-                print(f"Agent {ejected_id} was ejected with {max_votes} votes!")
+                if isinstance(agent, Imposter):
+                    self.imposters_ejected += 1
+                else:
+                    self.crewmates_ejected += 1
+                # Move ejected agent to a corner for visual indication (not a room change)
+                self.move_agent(agent, (0, 0), transition=False)
+                self.log.info("ejection", "Agent %s was ejected with %s votes!", ejected_id, max_votes,
+                              agent=ejected_id, imposter=isinstance(agent, Imposter))
                 break
         
         self.reset_round()
 
+    def sync_suspicions(self):
+        """Copy the suspicion records held by the shard workers back onto the crewmates"""
+        pairs = self.shards.sync()
+        for agent in self.schedule.agents:
+            if agent.unique_id in pairs:
+                agent.suspicion_pairs = pairs[agent.unique_id]
+
+    def sharded_step(self):
+        """Task-phase tick with neighbourhood queries and observation run by the shard workers.
+
+        Imposters act on a snapshot taken at the start of the tick, crewmates
+        observe a snapshot taken after everyone has moved.
+        """
+        players = {a.unique_id: a for a in self.schedule.agents}
+        order = list(players.values())
+        self.random.shuffle(order)
+
+        self.shards.publish(order, lambda a: isinstance(a, Imposter))
+        targets = self.shards.query("imposters")
+        for agent in order:
+            if isinstance(agent, Imposter):
+                agent.step([players[i] for i in targets.get(agent.unique_id, [])])
+            elif agent.alive:
+                agent.act()
+
+        # Observation (suspicion records, traces) runs in the shards; bodies come back
+        self.shards.publish(order, lambda a: isinstance(a, Imposter))
+        crewmates = [a for a in order if isinstance(a, Crewmate) and a.alive]
+        bodies = self.shards.observe(crewmates, self.schedule.steps, self.suspicion_window)
+        for agent in crewmates:
+            if agent.unique_id in bodies:
+                agent.check_for_bodies([players[i] for i in bodies[agent.unique_id]])
+
+        self.schedule.steps += 1
+        self.schedule.time += 1
+
+    def simultaneous_step(self):
+        """Task-phase tick where every agent decides from the same snapshot.
+
+        All agents decide first without changing anything. Then kills commit,
+        then moves and task progress, then crewmates observe. Each phase runs
+        in unique_id order, so two imposters after the same crewmate always
+        resolve the same way and the result doesn't depend on a shuffle.
+        """
+        alive = sorted((a for a in self.schedule.agents if a.alive), key=lambda a: a.unique_id)
+        intents = {agent: agent.decide() for agent in alive}
+
+        for agent in alive:
+            if isinstance(agent, Imposter):
+                if agent.kill_cooldown > 0:
+                    agent.kill_cooldown -= 1
+                elif intents[agent][0]:
+                    agent.kill(intents[agent][0])
+
+        for agent in alive:
+            intent = intents[agent]
+            if agent.alive and intent is not None:
+                agent.commit(intent)
+
+        for agent in alive:
+            if isinstance(agent, Crewmate) and agent.alive:
+                visible_agents = self.grid.get_neighbors(
+                    agent.pos, moore=True, radius=agent.visibility, include_center=True
+                )
+                agent.observe(visible_agents)
+
+        self.schedule.steps += 1
+        self.schedule.time += 1
+
+    def close(self):
+        """Release shard workers and shared memory, and flush the event log"""
+        if not self.closed:
+            self.closed = True
+            metrics.GAMES_COMPLETED.inc()
+            if self.in_meeting:
+                self.in_meeting = False
+                metrics.MEETINGS_IN_FLIGHT.dec()
+        self.log.flush()
+        if self.shards:
+            self.sync_suspicions()
+            self.shards.close()
+            self.shards = None
+
     def step(self):
         if self.game_over:
             self.running = False  # Stop the simulation
+            self.close()
             return
-        
+
+        metrics.STEPS.inc()
         if self.phase == "tasks":
-            self.schedule.step()
+            if self.shards:
+                self.sharded_step()
+            elif self.activation == "simultaneous":
+                self.simultaneous_step()
+            else:
+                self.schedule.step()
             # Check if body was reported
             if self.reported_body:
                 self.phase = "discussion"
                 self.discussion_time = 5  # 5 steps for discussion
+                if not self.in_meeting:
+                    self.in_meeting = True
+                    metrics.MEETINGS_IN_FLIGHT.inc()
         
         elif self.phase == "discussion":
             if self.discussion_time > 0:
@@ -291,13 +577,15 @@ class AmongUsModel(Model):
             self.game_over = True
             self.running = False  # Stop the simulation
             self.winner = "Crewmates"
-            print("GAME OVER - Crewmates win by eliminating all imposters!")
+            self.log.info("game_over", "GAME OVER - Crewmates win by eliminating all imposters!", winner=self.winner)
+            self.close()
             return
         if alive_crewmates == 0:
             self.game_over = True
             self.running = False  # Stop the simulation
             self.winner = "Imposter"
-            print("GAME OVER - Imposter wins by eliminating all crewmates!")
+            self.log.info("game_over", "GAME OVER - Imposter wins by eliminating all crewmates!", winner=self.winner)
+            self.close()
             return
 
         # 2) Win by task completion
@@ -311,5 +599,6 @@ class AmongUsModel(Model):
             self.game_over = True
             self.running = False  # Stop the simulation
             self.winner = "Crewmates"
-            print("GAME OVER - Crewmates win! All tasks have been completed.")
+            self.log.info("game_over", "GAME OVER - Crewmates win! All tasks have been completed.", winner=self.winner)
+            self.close()
             return
\ No newline at end of file
@@ -0,0 +1,141 @@
+from suspicion import intern_room
+
+
+class OccupancyMap:
+    """Players per grid cell, kept in sync with every move the model makes.
+
+    Label agents never move, so isolation checks only need to look at player
+    positions instead of full ``get_neighbors`` scans. The map also holds a
+    static list of low-traffic cells (hallways, quietest first) that imposters
+    patrol between.
+    """
+    def __init__(self, width, height, rooms, task_locations):
+        self.width = width
+        self.height = height
+        self.cells = {}
+        self.low_traffic = self._low_traffic_cells(rooms, task_locations)
+
+    @staticmethod
+    def _low_traffic_cells(rooms, task_locations):
+        """Hallway cells ordered by distance from the nearest task location"""
+        cells = [
+            (x, y)
+            for room in rooms if room[4] == "Hallway"
+            for x in range(room[0], room[2] + 1)
+            for y in range(room[1], room[3] + 1)
+        ]
+        if not task_locations:
+            return cells
+
+        def quietness(cell):
+            return min(abs(cell[0] - tx) + abs(cell[1] - ty) for tx, ty in task_locations)
+        return sorted(cells, key=quietness, reverse=True)
+
+    def place(self, agent, pos):
+        self.cells.setdefault(pos, []).append(agent)
+
+    def remove(self, agent, pos):
+        occupants = self.cells.get(pos)
+        if occupants and agent in occupants:
+            occupants.remove(agent)
+            if not occupants:
+                del self.cells[pos]
+
+    def move(self, agent, old_pos, new_pos):
+        self.remove(agent, old_pos)
+        self.place(agent, new_pos)
+
+    def alive_around(self, pos):
+        """Alive players in the 8 cells surrounding ``pos``"""
+        x, y = pos
+        found = []
+        for nx in range(max(0, x - 1), min(self.width, x + 2)):
+            for ny in range(max(0, y - 1), min(self.height, y + 2)):
+                if nx == x and ny == y:
+                    continue
+                for agent in self.cells.get((nx, ny), ()):
+                    if agent.alive:
+                        found.append(agent)
+        return found
+
+    def next_lurk_spot(self, pos, avoid=None):
+        """Low-traffic cell to head for next from ``pos``.
+
+        Cells with the fewest alive players on or around them right now win;
+        ties go to the quieter (by static ranking) and closer cell. ``avoid``
+        is skipped, so an imposter that reached or cannot reach its spot
+        moves on to another one.
+        """
+        x, y = pos
+        best, best_score = None, None
+        for rank, cell in enumerate(self.low_traffic):
+            if cell == pos or cell == avoid:
+                continue
+            crowd = len(self.alive_around(cell)) + sum(1 for a in self.cells.get(cell, ()) if a.alive)
+            score = (crowd, rank + abs(cell[0] - x) + abs(cell[1] - y))
+            if best_score is None or score < best_score:
+                best, best_score = cell, score
+        return best
+
+
+class RoomIndex:
+    """Room occupants and per-agent room entry steps, updated on room changes.
+
+    Cells are mapped to room names once, so room lookups and "who is in this
+    room" questions are O(1) instead of scanning rooms or agents.
+    """
+    def __init__(self, rooms, default="Hallway"):
+        self.default = default
+        self.cell_rooms = {}
+        for room in rooms:
+            intern_room(room[4])
+            for x in range(room[0], room[2] + 1):
+                for y in range(room[1], room[3] + 1):
+                    self.cell_rooms.setdefault((x, y), room[4])
+        self.occupants = {}   # room name -> {agent: None}, insertion ordered
+        self.current = {}     # agent -> (room name, entry step)
+        self.transitions = {} # agent_id -> number of room changes
+
+    def room_of(self, pos):
+        return self.cell_rooms.get(pos, self.default)
+
+    def enter(self, agent, pos, step):
+        room = self.room_of(pos)
+        self.occupants.setdefault(room, {})[agent] = None
+        self.current[agent] = (room, step)
+        self.transitions.setdefault(agent.unique_id, 0)
+
+    def leave(self, agent):
+        room, _ = self.current.pop(agent, (None, None))
+        if room is not None:
+            self.occupants[room].pop(agent, None)
+
+    def move(self, agent, pos, step, transition=True):
+        """Update the index only when the move crosses a room boundary.
+
+        ``transition=False`` relocates the agent without counting a room change
+        (e.g. an ejected player moved off the map).
+        """
+        room = self.room_of(pos)
+        if self.current.get(agent, (None,))[0] == room:
+            return
+        self.leave(agent)
+        self.enter(agent, pos, step)
+        if transition:
+            self.transitions[agent.unique_id] += 1
+
+    def alive_in(self, room):
+        """Alive players currently in ``room``"""
+        return [agent for agent in self.occupants.get(room, ()) if agent.alive]
+
+    def dwell(self, agent, step):
+        """Steps ``agent`` has spent in its current room"""
+        return step - self.current[agent][1]
+
+    def loitering(self, step, min_steps):
+        """{agent_id: steps} for alive players who have stayed in the hallway at least ``min_steps``"""
+        return {
+            agent.unique_id: self.dwell(agent, step)
+            for agent in self.alive_in(self.default)
+            if self.dwell(agent, step) >= min_steps
+        }
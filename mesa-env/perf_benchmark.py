@@ -0,0 +1,318 @@
+"""Performance regression benchmarks for the simulation.
+
+Runs deterministic scenarios against the offline LLM stand-in and compares the
+results with perf_baselines.json. Every metric is "lower is better"; a run fails
+when a metric exceeds its baseline by more than the tolerance.
+
+Timings are compared relative to a fixed calibration workload timed in the same
+run, so a slower or busier machine raises the limits along with the results.
+Baselines store seconds as they would be on the machine that first recorded
+them, alongside that machine's ``calibration_seconds``.
+
+    python perf_benchmark.py                  # compare against baselines
+    python perf_benchmark.py --tolerance 0.5  # allow 50% slack
+    python perf_benchmark.py --update         # record new baselines
+    python perf_benchmark.py --shards         # report sharded-mode scaling
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from agents import Crewmate
+from events import SILENT
+from model import AmongUsModel
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baselines.json")
+
+
+def make_model(num_agents, num_imposters=1, seed=0, **kwargs):
+    return AmongUsModel(
+        num_agents=num_agents, num_imposters=num_imposters, llm_type="offline", seed=seed,
+        log_level=SILENT, **kwargs
+    )
+
+
+def finish(model):
+    for agent in model.schedule.agents:
+        if isinstance(agent, Crewmate):
+            agent.close_trace_file()
+    model.close()
+
+
+def best_of(repeats, fn):
+    """Smallest wall time of ``repeats`` calls to ``fn``"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate(repeats=7):
+    """Seconds for a fixed pure-Python workload, the unit timings are scaled by"""
+    def run():
+        cells = {}
+        for i in range(60000):
+            cells.setdefault((i * 7 % 97, i * 13 % 89), []).append(i)
+        sorted((len(v), k) for k, v in cells.items())
+        "".join(f"{k}:{len(v)}" for k, v in cells.items())
+    return best_of(repeats, run)
+
+
+def bench_construction():
+    """Seconds to build a 200-agent model"""
+    return best_of(7, lambda: finish(make_model(200, 2)))
+
+
+def bench_step(num_agents, steps, repeats, **kwargs):
+    """Seconds per AmongUsModel.step with ``num_agents`` players.
+
+    Goes through the model's own step, so meetings, the simultaneous
+    activation and sharded perception are measured when the scenario
+    reaches or enables them. Shard worker start-up is not timed.
+    """
+    def run():
+        model = make_model(num_agents, 2, **kwargs)
+        taken = 0
+        start = time.perf_counter()
+        while model.running and taken < steps:
+            model.step()
+            taken += 1
+        elapsed = time.perf_counter() - start
+        finish(model)
+        return elapsed / taken
+    return min(run() for _ in range(repeats))
+
+
+def bench_discussion():
+    """Seconds for one discussion_step with 30 crewmates"""
+    def run():
+        model = make_model(30, 2)
+        for _ in range(20):
+            model.schedule.step()
+        victim = next(a for a in model.schedule.agents if isinstance(a, Crewmate))
+        victim.alive = False
+        model.reported_body = victim.pos
+        model.phase = "discussion"
+        start = time.perf_counter()
+        model.discussion_step()
+        elapsed = time.perf_counter() - start
+        finish(model)
+        return elapsed
+    return min(run() for _ in range(7))
+
+
+def bench_update_suspicions(rounds=20):
+    """Seconds per update_suspicions call with 50 crewmates"""
+    model = make_model(50, 2)
+    for _ in range(10):
+        model.schedule.step()
+    crewmates = [a for a in model.schedule.agents if isinstance(a, Crewmate) and a.alive]
+    visible = {
+        a: model.grid.get_neighbors(a.pos, moore=True, radius=a.visibility, include_center=True)
+        for a in crewmates
+    }
+
+    def run():
+        for agent in crewmates:
+            agent.update_suspicions(visible[agent])
+    elapsed = best_of(rounds, run)
+    finish(model)
+    return elapsed / len(crewmates)
+
+
+def bench_memory_growth(warmup=50, steps=200):
+    """Bytes allocated per step over a long game, after warm-up"""
+    model = make_model(20, 0)
+    for _ in range(warmup):
+        model.schedule.step()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(steps):
+        model.schedule.step()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    finish(model)
+    return max(0, growth) / steps
+
+
+def bench_memory_per_agent(small=100, large=300):
+    """Bytes per player at construction (marginal, large vs small population)"""
+    def traced_size(num_agents):
+        tracemalloc.start()
+        model = make_model(num_agents, 1)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        finish(model)
+        return size
+    return (traced_size(large) - traced_size(small)) / (large - small)
+
+
+def bench_memory_per_suspicion_pair(steps=30):
+    """Bytes per suspicion record (with its room history) after a short game"""
+    tracemalloc.start()
+    model = make_model(30, 1)
+    for _ in range(steps):
+        model.schedule.step()
+    before = tracemalloc.get_traced_memory()[0]
+    pairs = 0
+    for agent in model.schedule.agents:
+        if isinstance(agent, Crewmate):
+            pairs += len(agent.suspicion_pairs)
+            agent.suspicion_pairs = {}
+    freed = before - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    finish(model)
+    return freed / pairs if pairs else 0.0
+
+
+# name -> (benchmark, absolute slack added to the tolerance, scaled by calibration)
+BENCHMARKS = {
+    "construction_seconds": (bench_construction, 0.0, True),
+    "step_seconds_10_agents": (lambda: bench_step(10, steps=100, repeats=7), 0.0, True),
+    "step_seconds_50_agents": (lambda: bench_step(50, steps=40, repeats=5), 0.0, True),
+    "step_seconds_100_agents": (lambda: bench_step(100, steps=20, repeats=3), 0.0, True),
+    "step_seconds_50_agents_simultaneous": (
+        lambda: bench_step(50, steps=40, repeats=5, activation="simultaneous"), 0.0, True
+    ),
+    "step_seconds_50_agents_sharded": (lambda: bench_step(50, steps=40, repeats=3, num_shards=2), 0.0, True),
+    "discussion_step_seconds": (bench_discussion, 0.0, True),
+    "update_suspicions_seconds": (bench_update_suspicions, 0.0, True),
+    "memory_growth_bytes_per_step": (bench_memory_growth, 1024.0, False),
+    "memory_bytes_per_agent": (bench_memory_per_agent, 0.0, False),
+    "memory_bytes_per_suspicion_pair": (bench_memory_per_suspicion_pair, 0.0, False),
+}
+
+
+def run_benchmarks(names=None):
+    results = {"calibration_seconds": calibrate()}
+    print(f"calibration_seconds: {results['calibration_seconds']:.6g}")
+    workdir = os.getcwd()
+    # Trace logs go to a scratch directory; model output is discarded
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for name, (benchmark, _, _) in BENCHMARKS.items():
+                if names and name not in names:
+                    continue
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    results[name] = benchmark()
+                print(f"{name}: {results[name]:.6g}")
+        finally:
+            os.chdir(workdir)
+    return results
+
+
+def shard_scaling(num_agents=100, steps=20, shard_counts=(0, 2, 4)):
+    """Wall and parent-process CPU seconds for ``steps`` model steps per shard count.
+
+    Not a gated metric: the speedup depends on how many cores the machine has.
+    Parent CPU shows how much per-tick work moved into the shard workers.
+    """
+    rows = []
+    for num_shards in shard_counts:
+        model = AmongUsModel(
+            num_agents=num_agents, num_imposters=2, llm_type="offline", seed=0,
+            log_level=SILENT, num_shards=num_shards
+        )
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(steps):
+            model.step()
+        rows.append((num_shards, time.perf_counter() - wall, time.process_time() - cpu))
+        finish(model)
+    return rows
+
+
+def machine_ratio(results, baselines):
+    """How much slower this run's machine is than the one baselines were recorded on"""
+    if "calibration_seconds" not in baselines:
+        return 1.0
+    return results["calibration_seconds"] / baselines["calibration_seconds"]
+
+
+def compare(results, baselines, tolerance):
+    """Return the names of metrics that regressed past the tolerance"""
+    regressions = []
+    ratio = machine_ratio(results, baselines)
+    print(f"machine ratio: {ratio:.3g}")
+    for name, value in results.items():
+        if name not in BENCHMARKS:
+            continue
+        if name not in baselines:
+            print(f"{name}: no baseline")
+            continue
+        _, slack, scaled = BENCHMARKS[name]
+        limit = baselines[name] * (ratio if scaled else 1.0) * (1 + tolerance) + slack
+        status = "REGRESSION" if value > limit else "ok"
+        print(f"{name}: {value:.6g} (baseline {baselines[name]:.6g}, limit {limit:.6g}) {status}")
+        if value > limit:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation performance regression benchmarks")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown over baseline (default 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="Store results as the new baselines")
+    parser.add_argument("--shards", action="store_true", help="Report sharded-mode scaling and exit")
+    parser.add_argument("benchmarks", nargs="*", help="Run only these benchmarks")
+    args = parser.parse_args()
+
+    if args.shards:
+        print(f"{os.cpu_count()} CPUs")
+        workdir = os.getcwd()
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            try:
+                rows = shard_scaling()
+            finally:
+                os.chdir(workdir)
+        serial = rows[0][1]
+        for num_shards, wall, cpu in rows:
+            print(f"shards={num_shards}: wall {wall:.2f}s (speedup {serial / wall:.2f}x), parent cpu {cpu:.2f}s")
+        return 0
+
+    results = run_benchmarks(args.benchmarks)
+
+    if args.update:
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baselines = json.load(f)
+        if "calibration_seconds" in baselines:
+            # Keep the file in the units of the machine that first recorded it
+            ratio = machine_ratio(results, baselines)
+            results = {
+                name: value / ratio if name in BENCHMARKS and BENCHMARKS[name][2] else value
+                for name, value in results.items() if name != "calibration_seconds"
+            }
+        baselines.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=4, sort_keys=True)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline file at {args.baseline}; run with --update first")
+        return 1
+    with open(args.baseline) as f:
+        baselines = json.load(f)
+
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+        print(f"Performance regressions: {', '.join(regressions)}")
+        return 1
+    print("No performance regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
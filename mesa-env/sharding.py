@@ -0,0 +1,308 @@
+import pickle
+from multiprocessing import get_context, shared_memory
+import numpy as np
+from suspicion import intern_room, room_names, pack_pairs, unpack_pairs, record_covisibility, trace_entry
+
+# Columns of the shared agent table
+ID, X, Y, ALIVE, ROLE = range(5)
+CREWMATE, IMPOSTER = 1, 2
+
+
+class ShardLayout:
+    """Split grid rows into contiguous bands, one per worker.
+
+    A band keeps a crewmate it already holds until the crewmate is more than
+    ``slack`` rows outside it, so agents walking along a band edge don't
+    bounce their records between workers every tick.
+    """
+    def __init__(self, height, num_shards, halo, slack=0):
+        self.height = height
+        self.halo = halo
+        self.slack = slack
+        size = -(-height // num_shards)  # Ceiling division
+        self.bands = [
+            (y0, min(y0 + size, height))
+            for y0 in range(0, height, size)
+        ]
+
+    def band_index(self, y):
+        """Index of the band that owns row ``y``"""
+        return min(y // (self.bands[0][1] - self.bands[0][0]), len(self.bands) - 1)
+
+    def keeps(self, index, y):
+        """Whether band ``index`` keeps holding a crewmate standing on row ``y``"""
+        y0, y1 = self.bands[index]
+        return y0 - self.slack <= y < y1 + self.slack
+
+    def halo_band(self, band):
+        """Rows a worker needs to read: its band, slack and halo rows on both sides"""
+        y0, y1 = band
+        reach = self.halo + self.slack
+        return max(0, y0 - reach), min(self.height, y1 + reach)
+
+
+def _bucket_cells(rows):
+    """Group agent table rows (plain int lists) by cell"""
+    cells = {}
+    for row in rows:
+        cells.setdefault((row[X], row[Y]), []).append(row)
+    return cells
+
+
+def _visible_ids(cells, x, y, radius, width, height, self_id):
+    """Ids of players within a Moore radius, matching MultiGrid.get_neighbors"""
+    visible = []
+    for cx in range(max(0, x - radius), min(width, x + radius + 1)):
+        for cy in range(max(0, y - radius), min(height, y + radius + 1)):
+            for row in cells.get((cx, cy), ()):
+                if row[ID] != self_id:
+                    visible.append(row[ID])
+    return visible
+
+
+def _alive_around(cells, x, y, width, height):
+    """Alive players in the 8 cells surrounding (x, y)"""
+    found = []
+    for cx in range(max(0, x - 1), min(width, x + 2)):
+        for cy in range(max(0, y - 1), min(height, y + 2)):
+            if (cx, cy) == (x, y):
+                continue
+            found.extend(row for row in cells.get((cx, cy), ()) if row[ALIVE])
+    return found
+
+
+def _isolated_targets(cells, x, y, width, height):
+    """Crewmates next to an imposter whose only alive neighbour is that imposter"""
+    targets = []
+    for row in _alive_around(cells, x, y, width, height):
+        if row[ROLE] != CREWMATE:
+            continue
+        if len(_alive_around(cells, row[X], row[Y], width, height)) == 1:
+            targets.append(row[ID])
+    return targets
+
+
+class _Observer:
+    """Suspicion records and trace file of one crewmate, held by the shard it stands in"""
+    __slots__ = ("agent_id", "pairs", "trace", "append")
+
+    def __init__(self, agent_id, pairs, append):
+        self.agent_id = agent_id
+        self.pairs = pairs
+        self.trace = None
+        self.append = append  # Continue this round's trace instead of starting it
+
+    def observe(self, pos, visible, room, step, window):
+        trace_pairs = record_covisibility(self.pairs, visible, room, step, window)
+        if self.trace is None:
+            self.trace = open(f"agent_{self.agent_id}_trace.log", "a" if self.append else "w")
+            self.append = True
+        self.trace.write(trace_entry(step, trace_pairs, True, pos, visible))
+        self.trace.flush()
+
+    def close_trace(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
+    def release(self):
+        """Hand the crewmate to another shard"""
+        self.close_trace()
+        return pack_pairs(self.pairs), self.append
+
+
+def _shard_worker(conn, shm_name, capacity, band, read_band, width, height, radii, cell_rooms, default_room,
+                  room_names):
+    """Answer perception queries, and run crewmate observation, for one band of rows"""
+    for name in room_names:
+        intern_room(name)  # Same room ids as the parent, so packed records move as-is
+    shm = shared_memory.SharedMemory(name=shm_name)
+    table = np.ndarray((capacity, 5), dtype=np.int32, buffer=shm.buf)
+    owned = {}  # agent_id -> _Observer
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            query, args = message
+            if query == "release":
+                # Pickled here and unpickled by the new owner; the parent only forwards bytes
+                conn.send({
+                    agent_id: pickle.dumps(owned.pop(agent_id).release())
+                    for agent_id in args if agent_id in owned
+                })
+                continue
+            if query == "sync":
+                conn.send({agent_id: pack_pairs(observer.pairs) for agent_id, observer in owned.items()})
+                continue
+            if query == "reset":
+                # Meeting over: the next trace write starts a fresh file
+                for observer in owned.values():
+                    observer.close_trace()
+                    observer.append = False
+                conn.send(None)
+                continue
+
+            count = args[0]
+            ys = table[:count, Y]
+            nearby = table[:count][(ys >= read_band[0]) & (ys < read_band[1])].tolist()
+            cells = _bucket_cells(nearby)
+            if query == "observe":
+                _, step, window, adopted = args
+                for agent_id, state in adopted.items():
+                    packed, append = pickle.loads(state)
+                    owned[agent_id] = _Observer(agent_id, unpack_pairs(packed), append)
+                alive = {row[ID]: row[ALIVE] for row in nearby}
+
+            results = {}
+            for row in nearby:
+                x, y = row[X], row[Y]
+                if not row[ALIVE]:
+                    continue
+                if query == "observe":
+                    # Crewmates this worker holds, which may stand just outside its band
+                    if row[ID] not in owned:
+                        continue
+                    visible = _visible_ids(cells, x, y, radii[CREWMATE], width, height, row[ID])
+                    room = cell_rooms.get((x, y), default_room)
+                    owned[row[ID]].observe((x, y), visible, room, step, window)
+                    bodies = [agent_id for agent_id in visible if not alive[agent_id]]
+                    if bodies:
+                        results[row[ID]] = bodies
+                elif not (band[0] <= y < band[1]):
+                    continue
+                elif query == "crewmates" and row[ROLE] == CREWMATE:
+                    results[row[ID]] = _visible_ids(cells, x, y, radii[CREWMATE], width, height, row[ID])
+                elif query == "imposters" and row[ROLE] == IMPOSTER:
+                    results[row[ID]] = _isolated_targets(cells, x, y, width, height)
+            conn.send(results)
+    finally:
+        for observer in owned.values():
+            observer.close_trace()
+        del table
+        shm.close()
+
+
+class ShardPool:
+    """Worker processes that own row bands of the grid.
+
+    Each worker answers imposter isolation queries and runs crewmate
+    observation (co-visibility records, trace files, body sightings) for the
+    players standing in its band. It reads halo rows as wide as the largest
+    visibility radius, so results stay correct near a band edge. A crewmate's
+    suspicion records move with it when it crosses into another band.
+
+    The parent stays authoritative. It writes every player's position to a
+    shared-memory table each tick, and applies moves, kills and meetings
+    itself. Those parts, plus one or two pipe round trips per tick, do not
+    parallelize, so speedup is bounded by the parent's share of a tick and by
+    the number of cores (see ``perf_benchmark.py --shards``).
+    """
+    def __init__(self, model, num_shards, crewmate_visibility, imposter_visibility):
+        self.capacity = max(1, len(model.schedule.agents))
+        self.width = model.grid.width
+        halo = max(crewmate_visibility, imposter_visibility)
+        self.layout = ShardLayout(model.grid.height, num_shards, halo, slack=halo)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.capacity * 5 * 4)
+        self.table = np.ndarray((self.capacity, 5), dtype=np.int32, buffer=self.shm.buf)
+        self.count = 0
+
+        self.owner = {}  # crewmate id -> index of the worker holding its records
+
+        radii = {CREWMATE: crewmate_visibility, IMPOSTER: imposter_visibility}
+        ctx = get_context("spawn")
+        self.workers = []
+        for band in self.layout.bands:
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_shard_worker,
+                args=(child_conn, self.shm.name, self.capacity, band,
+                      self.layout.halo_band(band), self.width, model.grid.height, radii,
+                      model.room_index.cell_rooms, model.room_index.default, room_names()),
+                daemon=True,
+            )
+            process.start()
+            self.workers.append((process, parent_conn))
+
+    def publish(self, agents, is_imposter):
+        """Write the current position and state of every placed player"""
+        count = 0
+        for agent in agents:
+            if agent.pos is None:
+                continue
+            self.table[count] = (
+                agent.unique_id, agent.pos[0], agent.pos[1], agent.alive,
+                IMPOSTER if is_imposter(agent) else CREWMATE,
+            )
+            count += 1
+        self.count = count
+
+    def _ask(self, messages):
+        """Send one message per worker index, then collect the replies in the same order"""
+        for index, message in messages.items():
+            self.workers[index][1].send(message)
+        return {index: self.workers[index][1].recv() for index in messages}
+
+    def query(self, kind):
+        """Ask every shard about its owned agents; returns {agent_id: [agent_ids]}"""
+        results = {}
+        for reply in self._ask({i: (kind, (self.count,)) for i in range(len(self.workers))}).values():
+            results.update(reply)
+        return results
+
+    def observe(self, crewmates, step, window):
+        """Run one tick of observation for alive ``crewmates`` in the shards.
+
+        Records of crewmates that wandered out of their shard's reach are
+        moved to the shard they now stand in first. Returns ``{agent_id: [dead agent ids in view]}`` for crewmates
+        that can see a body.
+        """
+        adopted = [{} for _ in self.workers]
+        leaving = {}
+        for agent in crewmates:
+            owner = self.owner.get(agent.unique_id)
+            if owner is not None and self.layout.keeps(owner, agent.pos[1]):
+                continue
+            shard = self.layout.band_index(agent.pos[1])
+            if owner is None:
+                adopted[shard][agent.unique_id] = pickle.dumps((pack_pairs(agent.suspicion_pairs), False))
+            else:
+                leaving.setdefault(owner, []).append(agent.unique_id)
+            self.owner[agent.unique_id] = shard
+        if leaving:
+            released = self._ask({owner: ("release", ids) for owner, ids in leaving.items()})
+            for states in released.values():
+                for agent_id, state in states.items():
+                    adopted[self.owner[agent_id]][agent_id] = state
+
+        bodies = {}
+        replies = self._ask({
+            i: ("observe", (self.count, step, window, adopted[i])) for i in range(len(self.workers))
+        })
+        for reply in replies.values():
+            bodies.update(reply)
+        return bodies
+
+    def sync(self):
+        """Current suspicion records of every crewmate held by the shards"""
+        pairs = {}
+        for reply in self._ask({i: ("sync", None) for i in range(len(self.workers))}).values():
+            for agent_id, packed in reply.items():
+                pairs[agent_id] = unpack_pairs(packed)
+        return pairs
+
+    def reset(self):
+        """Close the crewmates' trace files at the end of a meeting"""
+        self._ask({i: ("reset", None) for i in range(len(self.workers))})
+
+    def close(self):
+        if not self.workers:
+            return
+        for process, conn in self.workers:
+            conn.send(None)
+            process.join(timeout=5)
+            conn.close()
+        self.workers = []
+        del self.table
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,155 @@
+import json
+import tornado.escape
+import tornado.websocket
+from mesa.visualization.ModularVisualization import ModularServer
+
+
+class LiveSource:
+    """Frames rendered from one authoritative model, optionally recorded to a replay file"""
+    def __init__(self, model, render, record_path=None):
+        self.model = model
+        self.render = render
+        self.started = False
+        self._record = open(record_path, "w") if record_path else None
+
+    def next_frame(self):
+        if self.started:
+            if not self.model.running:
+                self.close()
+                return None
+            self.model.step()
+        self.started = True
+        frame = self.render()
+        if self._record:
+            self._record.write(json.dumps(frame) + "\n")
+            self._record.flush()
+        return frame
+
+    def close(self):
+        if self._record:
+            self._record.close()
+            self._record = None
+
+
+class ReplaySource:
+    """Frames streamed from a replay file written by LiveSource (one JSON frame per line)"""
+    def __init__(self, path):
+        self._file = open(path)
+
+    def next_frame(self):
+        if self._file is None:
+            return None
+        line = self._file.readline()
+        if not line:
+            self.close()
+            return None
+        return json.loads(line)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class FrameStream:
+    """Shared frame history; the source only advances when a viewer asks for a new frame"""
+    def __init__(self, source):
+        self.source = source
+        self.frames = []
+        self.finished = False
+
+    def frame(self, index):
+        while len(self.frames) <= index and not self.finished:
+            frame = self.source.next_frame()
+            if frame is None:
+                self.finished = True
+            else:
+                self.frames.append(frame)
+        if 0 <= index < len(self.frames):
+            return self.frames[index]
+        return None
+
+    def seek_index(self, index):
+        """Clamp a seek target: a live game only rewinds to frames already rendered, a replay can read ahead"""
+        if isinstance(self.source, LiveSource):
+            return min(index, max(0, len(self.frames) - 1))
+        return index
+
+    def live_index(self):
+        """Index of the newest frame (rendering the first one if needed)"""
+        self.frame(0)
+        return max(0, len(self.frames) - 1)
+
+
+class SpectatorSocketHandler(tornado.websocket.WebSocketHandler):
+    """Websocket for one viewer; each viewer keeps its own cursor into the shared stream"""
+
+    def open(self):
+        self.cursor = None  # Set to the live frame on the first reset
+        if self.application.verbose:
+            print("Spectator joined")
+        # No editable params: every viewer watches the same game
+        self.write_message({"type": "model_params", "params": {}})
+
+    def check_origin(self, origin):
+        return True
+
+    def send_frame(self, index):
+        frame = self.application.stream.frame(index)
+        if frame is None:
+            self.write_message({"type": "end"})
+            return
+        self.cursor = index
+        self.write_message({"type": "viz_state", "data": frame})
+
+    def on_message(self, message):
+        msg = tornado.escape.json_decode(message)
+        stream = self.application.stream
+
+        if msg["type"] == "get_step":
+            self.send_frame(0 if self.cursor is None else self.cursor + 1)
+
+        elif msg["type"] == "reset":
+            # The page sends a reset on load: join live. Later resets rewind.
+            self.send_frame(stream.live_index() if self.cursor is None else 0)
+
+        elif msg["type"] == "seek":
+            try:
+                index = int(msg["step"])
+            except (KeyError, TypeError, ValueError):
+                index = -1
+            if index < 0:
+                self.write_message({"type": "error", "message": "seek needs a non-negative integer step"})
+                return
+            # Seeking past the live frame would step the model (and its LLM calls) here
+            self.send_frame(stream.seek_index(index))
+
+        # submit_params is ignored: spectators cannot change the shared game
+
+
+class SpectatorServer(ModularServer):
+    """Serve one simulation (or a recorded replay) to any number of viewers.
+
+    Unlike ModularServer, viewers never step or reset the model directly.
+    The model advances once per new frame, whichever viewer asks for it
+    first. Every rendered frame is kept, so viewers can join mid-game and
+    seek with ``{"type": "seek", "step": n}``. Live seeks stop at the newest
+    rendered frame; only ``get_step`` advances the game.
+    """
+    def __init__(self, model_cls, visualization_elements, name="Mesa Model",
+                 model_params=None, port=None, replay_path=None, record_path=None):
+        self.replay_path = replay_path
+        self.record_path = record_path
+        super().__init__(model_cls, visualization_elements, name, model_params, port)
+        if replay_path:
+            self.description = f"Replay of {replay_path}"
+        # Takes precedence over ModularServer's /ws handler
+        self.add_handlers(r".*", [(r"/ws", SpectatorSocketHandler)])
+
+    def reset_model(self):
+        if self.replay_path:
+            self.model = None
+            self.stream = FrameStream(ReplaySource(self.replay_path))
+            return
+        super().reset_model()
+        self.stream = FrameStream(LiveSource(self.model, self.render_model, self.record_path))
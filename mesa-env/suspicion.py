@@ -0,0 +1,194 @@
+import re
+from array import array
+
+# Room names are interned to small ints so spans stay compact
+_ROOM_IDS = {}
+_ROOM_NAMES = []
+
+
+def intern_room(name):
+    """Return the interned id for a room name, allocating one if needed"""
+    room_id = _ROOM_IDS.get(name)
+    if room_id is None:
+        room_id = len(_ROOM_NAMES)
+        _ROOM_IDS[name] = room_id
+        _ROOM_NAMES.append(name)
+    return room_id
+
+
+def room_name(room_id):
+    """Return the room name for an interned id"""
+    return _ROOM_NAMES[room_id]
+
+
+class SuspicionRecord:
+    """Co-visibility history for one pair of agents.
+
+    ``count`` is the total number of ticks the pair was seen together.
+    ``spans`` is a flat int array of run-length-encoded
+    ``room_id, start_step, end_step`` triples, limited to the last ``window`` steps.
+    """
+    __slots__ = ("count", "spans")
+
+    def __init__(self):
+        self.count = 0
+        self.spans = array("i")
+
+    def add(self, room, step, window=None):
+        self.count += 1
+        room_id = intern_room(room)
+        spans = self.spans
+        if spans and spans[-3] == room_id and spans[-1] >= step - 1:
+            spans[-1] = step
+        else:
+            spans.extend((room_id, step, step))
+        self.trim(step, window)
+
+    def trim(self, step, window):
+        """Drop spans that ended before the retention window"""
+        if window is None:
+            return
+        oldest = step - window
+        spans = self.spans
+        drop = 0
+        while drop < len(spans) and spans[drop + 2] < oldest:
+            drop += 3
+        if drop:
+            del spans[:drop]
+
+    def __getstate__(self):
+        # Room ids are process-local, so pickles carry room names
+        return self.count, [(room_name(room_id), start, end) for room_id, start, end in self.iter_spans()]
+
+    def __setstate__(self, state):
+        self.count, spans = state
+        self.spans = array("i")
+        for room, start, end in spans:
+            self.spans.extend((intern_room(room), start, end))
+
+    def iter_spans(self, step=None, window=None):
+        """Spans as ``(room_id, start, end)``; with ``step`` and ``window``, only
+        those that end inside the window, even if the record was not trimmed lately"""
+        oldest = step - window if step is not None and window is not None else None
+        spans = self.spans
+        for i in range(0, len(spans), 3):
+            if oldest is None or spans[i + 2] >= oldest:
+                yield spans[i], spans[i + 1], spans[i + 2]
+
+    def rooms(self, step=None, window=None):
+        """Room names of the retained spans, oldest first"""
+        return [room_name(room_id) for room_id, _, _ in self.iter_spans(step, window)]
+
+    def to_prompt(self, step=None, window=None):
+        spans = ", ".join(
+            f"{room_name(room_id)} {start}-{end}" if start != end else f"{room_name(room_id)} {start}"
+            for room_id, start, end in self.iter_spans(step, window)
+        )
+        return f"{self.count} ticks [{spans}]"
+
+    def __repr__(self):
+        return f"SuspicionRecord({self.to_prompt()})"
+
+
+def room_names():
+    """Interned room names in id order; interning them in this order elsewhere gives the same ids"""
+    return list(_ROOM_NAMES)
+
+
+def pack_pairs(suspicion_pairs):
+    """Compact form of a ``{pair: SuspicionRecord}`` dict for moving records between processes.
+
+    Spans keep their room ids, so both sides must have interned the same room
+    names in the same order (see ``room_names``).
+    """
+    pairs, counts, lengths, spans = [], array("i"), array("i"), array("i")
+    for pair, record in suspicion_pairs.items():
+        pairs.append(tuple(pair))
+        counts.append(record.count)
+        lengths.append(len(record.spans))
+        spans.extend(record.spans)
+    return pairs, counts, lengths, spans
+
+
+def unpack_pairs(packed):
+    pairs, counts, lengths, spans = packed
+    suspicion_pairs = {}
+    offset = 0
+    for pair, count, length in zip(pairs, counts, lengths):
+        record = SuspicionRecord()
+        record.count = count
+        record.spans = spans[offset:offset + length]
+        offset += length
+        suspicion_pairs[frozenset(pair)] = record
+    return suspicion_pairs
+
+
+def record_covisibility(suspicion_pairs, player_ids, room, step, window=None):
+    """Add one tick of co-visibility in ``room`` for every pair of ``player_ids``.
+
+    Returns the pair labels written to the trace for this tick.
+    """
+    trace_pairs = set()
+    for i in range(len(player_ids)):
+        for j in range(i + 1, len(player_ids)):
+            agent1, agent2 = player_ids[i], player_ids[j]
+            low, high = (agent1, agent2) if agent1 < agent2 else (agent2, agent1)
+            trace_pairs.add(f"{{Agent {low}, Agent {high}, {room}}}")
+
+            pair = frozenset((agent1, agent2))
+            record = suspicion_pairs.get(pair)
+            if record is None:
+                record = suspicion_pairs[pair] = SuspicionRecord()
+            # Extend the current room span (or open a new one)
+            record.add(room, step, window)
+    return trace_pairs
+
+
+def trace_entry(step, trace_pairs, alive, pos, visible_ids):
+    """The two trace lines a crewmate writes per tick"""
+    return (
+        f"Step {step}: [{', '.join(sorted(trace_pairs))}]\n"
+        f"Step {step}: Alive({alive}), Pos({pos}), Visible: {visible_ids}\n"
+    )
+
+
+def format_suspicions(suspicion_pairs, step=None, window=None):
+    """Serialize suspicion pairs into a compact prompt string.
+
+    With ``step`` and ``window``, spans that ended before ``step - window`` are
+    left out, so pairs that stopped being seen together don't carry stale rooms.
+    """
+    lines = []
+    for pair, record in sorted(suspicion_pairs.items(), key=lambda item: sorted(item[0])):
+        agents = " & ".join(f"Agent {agent_id}" for agent_id in sorted(pair))
+        lines.append(f"{agents}: {record.to_prompt(step, window)}")
+    return "\n".join(lines) if lines else "None"
+
+
+_TRACE_PAIR = re.compile(r"\{Agent (\d+), Agent (\d+), ([^}]+)\}")
+_TRACE_VISIBLE = re.compile(r"Visible: \[([\d, ]*)\]")
+
+
+def canonical_evidence(trace_content, player_ids, observer=None):
+    """Normalize a trace tail to the evidence it carries.
+
+    Keeps which pairs were seen together in which room and which players
+    were seen at all, from complete lines only; drops step numbers, positions, room label agents and
+    ordering. The observer counts as seen, so agents standing together
+    reduce to the same evidence.
+    """
+    if not trace_content.startswith("Step"):
+        # Tails are cut by length; ignore the partial first line
+        trace_content = trace_content.partition("\n")[2]
+    if not trace_content:
+        return frozenset(), frozenset()
+    pairs = frozenset(_TRACE_PAIR.findall(trace_content))
+    seen = {
+        int(agent_id)
+        for match in _TRACE_VISIBLE.findall(trace_content)
+        for agent_id in match.split(",") if agent_id.strip()
+    }
+    seen &= player_ids
+    if observer is not None:
+        seen.add(observer)
+    return pairs, frozenset(seen)
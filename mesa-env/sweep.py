@@ -0,0 +1,350 @@
+import hashlib
+import json
+import math
+import os
+import pickle
+from statistics import NormalDist
+from model import AmongUsModel
+from llm_budget import TokenLedger
+from events import SILENT
+from metrics import start_metrics_server
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def anytime_z(n, alpha=0.05):
+    """Critical value for an interval after ``n`` trials that holds at every ``n`` at once.
+
+    Spends ``alpha / (n * (n + 1))`` at trial count ``n``; these sum to
+    ``alpha``, so the intervals form a confidence sequence that may be checked
+    after every game without inflating the error rate.
+    """
+    return NormalDist().inv_cdf(1 - alpha / (2 * n * (n + 1)))
+
+
+class RunningStat:
+    """Streaming mean/variance (Welford)"""
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def interval(self, z=1.96):
+        if self.n == 0:
+            return 0.0, 0.0
+        margin = z * math.sqrt(self.variance / self.n)
+        return self.mean - margin, self.mean + margin
+
+
+class ConfigStats:
+    """Streaming estimates for one sweep configuration"""
+    def __init__(self, config):
+        self.config = config
+        self.games = 0
+        self.crewmate_wins = 0
+        self.timeouts = 0
+        self.imposters_ejected = 0
+        self.ejections = 0
+        self.game_length = RunningStat()
+        self.ledger = TokenLedger()
+        self.stopped = None  # Reason the configuration stopped early
+
+    def add(self, result):
+        """Add one ``game_result()`` dict"""
+        self.games += 1
+        if result["winner"] is None:
+            self.timeouts += 1
+        elif result["winner"] == "Crewmates":
+            self.crewmate_wins += 1
+        self.game_length.add(result["steps"])
+        self.imposters_ejected += result["imposters_ejected"]
+        self.ejections += result["imposters_ejected"] + result["crewmates_ejected"]
+        self.ledger.merge(TokenLedger.from_summary(result["llm"]))
+
+    @property
+    def decided(self):
+        return self.games - self.timeouts
+
+    @property
+    def win_rate(self):
+        return self.crewmate_wins / self.decided if self.decided else 0.0
+
+    def win_rate_interval(self, z=1.96):
+        return wilson_interval(self.crewmate_wins, self.decided, z)
+
+    def win_rate_sequence(self, alpha=0.05):
+        """Anytime-valid win-rate interval (used for stopping decisions)"""
+        if not self.decided:
+            return 0.0, 1.0
+        return wilson_interval(self.crewmate_wins, self.decided, anytime_z(self.decided, alpha))
+
+    @property
+    def ejection_precision(self):
+        return self.imposters_ejected / self.ejections if self.ejections else 0.0
+
+    def ejection_precision_interval(self, z=1.96):
+        return wilson_interval(self.imposters_ejected, self.ejections, z)
+
+    def summary(self):
+        low, high = self.win_rate_interval()
+        length_low, length_high = self.game_length.interval()
+        precision_low, precision_high = self.ejection_precision_interval()
+        return {
+            "config": self.config,
+            "games": self.games,
+            "timeouts": self.timeouts,
+            "crewmate_win_rate": self.win_rate,
+            "crewmate_win_rate_ci": (low, high),
+            "crewmate_win_rate_cs": self.win_rate_sequence(),
+            "game_length": self.game_length.mean,
+            "game_length_ci": (length_low, length_high),
+            "ejection_precision": self.ejection_precision,
+            "ejection_precision_ci": (precision_low, precision_high),
+            "llm": self.ledger.summary(),
+            "stopped": self.stopped,
+        }
+
+
+def should_stop(stats, all_stats, min_games=10, max_games=300, half_width=0.15, alpha=0.05):
+    """Sequential stop rule for one configuration.
+
+    Decisions use anytime-valid win-rate intervals (``win_rate_sequence``),
+    with ``alpha`` split across the configurations, so checking after every
+    round keeps the overall error rate at ``alpha``. A configuration stops
+    when its interval is narrower than ``half_width`` on each side
+    ("converged"), when another configuration's interval lies entirely above
+    it ("dominated"), when its interval lies above every other configuration's
+    ("separated"), or when it reaches ``max_games``.
+
+    Anytime-valid intervals are wide. At a 50% win rate with two to four
+    configurations, ``half_width=0.15`` takes about 250-280 decided games
+    (fewer at lopsided rates), so the defaults converge before ``max_games``.
+    ``half_width=0.1`` takes about 700 games, and 0.05 about 3500.
+    """
+    if stats.games >= max_games:
+        return "max_games"
+    if stats.decided < min_games:
+        return None
+
+    alpha /= len(all_stats)
+    low, high = stats.win_rate_sequence(alpha)
+    if (high - low) / 2 <= half_width:
+        return "converged"
+
+    others = [s.win_rate_sequence(alpha) for s in all_stats if s is not stats and s.decided >= min_games]
+    if any(high < other_low for other_low, _ in others):
+        return "dominated"
+    if others and all(low > other_high for _, other_high in others):
+        return "separated"
+    return None
+
+
+def game_result(model):
+    """The per-game numbers a sweep keeps, as a JSON-friendly dict"""
+    return {
+        "winner": model.winner,
+        "steps": model.schedule.steps,
+        "imposters_ejected": model.imposters_ejected,
+        "crewmates_ejected": model.crewmates_ejected,
+        "llm": model.ledger.summary(),
+    }
+
+
+class SweepManifest:
+    """Append-only record of a sweep, so a restarted sweep can pick up where it stopped.
+
+    Each line of the manifest is a JSON object: a ``"result"`` line per finished
+    game, and a ``"snapshot"`` line each time an in-flight game passes a meeting
+    boundary. Snapshots are pickled models written atomically next to the
+    manifest (``<path>.snapshots/``); only the newest one per game is kept.
+    A torn last line from a crash is dropped on load.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.snapshot_dir = path + ".snapshots"
+        self.results = {}    # (config key, seed) -> game_result dict
+        self.snapshots = {}  # (config key, seed) -> snapshot file path
+        if os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def key(config, seed):
+        return json.dumps(config, sort_keys=True), seed
+
+    def _load(self):
+        with open(self.path) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Torn write from a crash: cut it off so appends start on a fresh line
+                    self._truncate_tail(len(line.encode()))
+                    break
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = self.key(entry["config"], entry["seed"])
+                if entry["type"] == "result":
+                    self.results[key] = entry["result"]
+                    self.snapshots.pop(key, None)
+                elif entry["type"] == "snapshot" and os.path.exists(entry["path"]):
+                    self.snapshots[key] = entry["path"]
+
+    def _truncate_tail(self, size):
+        with open(self.path, "rb+") as f:
+            f.truncate(os.path.getsize(self.path) - size)
+
+    def _append(self, entry):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def result(self, config, seed):
+        return self.results.get(self.key(config, seed))
+
+    def record_result(self, config, seed, result):
+        self._append({"type": "result", "config": config, "seed": seed, "result": result})
+        key = self.key(config, seed)
+        self.results[key] = result
+        path = self.snapshots.pop(key, None)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def restore(self, config, seed):
+        """The model from the game's last snapshot, or None"""
+        path = self.snapshots.get(self.key(config, seed))
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def record_snapshot(self, config, seed, model):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        digest = hashlib.sha1(repr(self.key(config, seed)).encode()).hexdigest()[:16]
+        path = os.path.join(self.snapshot_dir, f"{digest}.pkl")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(model, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._append({
+            "type": "snapshot", "config": config, "seed": seed,
+            "step": model.schedule.steps, "path": path,
+        })
+        self.snapshots[self.key(config, seed)] = path
+
+
+def play_game(config, seed, max_steps=500, model_cls=AmongUsModel, manifest=None):
+    """Run one game to completion (or ``max_steps``) and return the model.
+
+    Games are silent unless the config sets ``log_level``. With a
+    ``manifest``, the game resumes from its last snapshot if it has one and
+    is snapshotted again after every meeting.
+    """
+    model = manifest.restore(config, seed) if manifest else None
+    if model is None:
+        model = model_cls(seed=seed, **{"log_level": SILENT, **config})
+    while model.running and model.schedule.steps < max_steps:
+        in_meeting = model.in_meeting
+        model.step()
+        # Between meetings no trace files are open, so the model pickles cleanly
+        if manifest and in_meeting and not model.in_meeting and model.running:
+            manifest.record_snapshot(config, seed, model)
+    model.close()
+    return model
+
+
+def run_sweep(configs, seed=0, min_games=10, max_games=300, half_width=0.15,
+              max_steps=500, on_result=None, model_cls=AmongUsModel, metrics_port=None,
+              manifest_path=None):
+    """Play games round-robin over ``configs`` until every configuration stops.
+
+    ``on_result(stats, model)`` is called after each game with the updated
+    streaming estimates. Returns one summary dict per configuration; the
+    ``"llm"`` entry of each holds its token and cost totals. With
+    ``metrics_port`` set, live metrics are served at ``/metrics`` on that
+    local port for the duration of the sweep.
+
+    With ``manifest_path``, progress is recorded in a ``SweepManifest``.
+    Rerunning the same sweep with the same path skips finished games and
+    resumes an interrupted one from its last meeting boundary.
+    """
+    manifest = SweepManifest(manifest_path) if manifest_path else None
+    server = start_metrics_server(metrics_port) if metrics_port else None
+    try:
+        return _run_sweep(configs, seed, min_games, max_games, half_width, max_steps, on_result,
+                          model_cls, manifest)
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+def _run_sweep(configs, seed, min_games, max_games, half_width, max_steps, on_result, model_cls, manifest):
+    all_stats = [ConfigStats(config) for config in configs]
+    game_seed = seed
+    while True:
+        active = [s for s in all_stats if s.stopped is None]
+        if not active:
+            break
+        for stats in active:
+            # Game seeds follow the same order on every run, so finished games line up
+            result = manifest.result(stats.config, game_seed) if manifest else None
+            if result is not None:
+                game_seed += 1
+                stats.add(result)
+                continue
+            model = play_game(stats.config, game_seed, max_steps, model_cls, manifest)
+            result = game_result(model)
+            if manifest:
+                manifest.record_result(stats.config, game_seed, result)
+            game_seed += 1
+            stats.add(result)
+            if on_result:
+                on_result(stats, model)
+        for stats in active:
+            stats.stopped = should_stop(stats, all_stats, min_games, max_games, half_width)
+    return [s.summary() for s in all_stats]
+
+
+def print_progress(stats, model):
+    low, high = stats.win_rate_interval()
+    print(
+        f"{stats.config}: game {stats.games}, winner {model.winner}, "
+        f"crewmate win rate {stats.win_rate:.2f} [{low:.2f}, {high:.2f}], "
+        f"length {stats.game_length.mean:.1f}, ejection precision {stats.ejection_precision:.2f}, "
+        f"tokens {stats.ledger.total_tokens}, cost ${stats.ledger.cost:.4f}"
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Sweep game configurations")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this local port")
+    parser.add_argument("--manifest", help="Record progress here and resume from it after a crash")
+    args = parser.parse_args()
+
+    configs = [{"num_imposters": n} for n in (1, 2)]
+    for summary in run_sweep(configs, on_result=print_progress, metrics_port=args.metrics_port,
+                             manifest_path=args.manifest):
+        print(summary)
@@ -1,4 +1,6 @@
 class Task:
+    __slots__ = ("name", "location", "progress", "complete")
+
     def __init__(self, name, location):
         self.name = name
         self.location = location